@@ -0,0 +1,88 @@
+"""
+Check startup import costs against a budget using python -X importtime
+
+Exits with status 1 when a module exceeds its budget or a module that must
+be imported lazily is loaded at startup.
+
+Usage: python -m benchmarks.import_budget [module] [--budget-ms N]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+# Cumulative import time allowed for the whole entry module
+DEFAULT_TOTAL_BUDGET_MS = 1500
+
+# Cumulative import time allowed for any single project module
+PROJECT_MODULE_BUDGET_MS = 150
+PROJECT_PACKAGES = ("controllers", "models", "patterns", "utils", "views")
+
+# Heavy optional dependencies that must only be imported on first use
+LAZY_MODULES = ("pandas", "openpyxl", "numpy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_imports(module):
+    """Import a module in a fresh interpreter and return {module: cumulative microseconds}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ""
+        raise RuntimeError(f"Importing {module} failed: {last_line}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # Header line
+        timings[parts[2].strip()] = cumulative
+    return timings
+
+def check(module, total_budget_ms):
+    """Return a list of budget violations for importing module"""
+    timings = measure_imports(module)
+    failures = []
+
+    total_ms = timings.get(module, 0) / 1000
+    print(f"{module}: {total_ms:.1f} ms cumulative (budget {total_budget_ms} ms)")
+    if total_ms > total_budget_ms:
+        failures.append(f"{module} took {total_ms:.1f} ms, budget is {total_budget_ms} ms")
+
+    for name, cumulative in sorted(timings.items(), key=lambda item: -item[1]):
+        top_level = name.split(".")[0]
+        if top_level in LAZY_MODULES:
+            failures.append(f"{name} is imported at startup; it must be imported on first use")
+        elif top_level in PROJECT_PACKAGES and name != module and cumulative / 1000 > PROJECT_MODULE_BUDGET_MS:
+            failures.append(f"{name} took {cumulative / 1000:.1f} ms, budget is {PROJECT_MODULE_BUDGET_MS} ms")
+
+    slowest = sorted(timings.items(), key=lambda item: -item[1])[:10]
+    for name, cumulative in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_TOTAL_BUDGET_MS)
+    args = parser.parse_args()
+
+    try:
+        failures = check(args.module, args.budget_ms)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare reading tasks from task_Lists.conf with reading the binary snapshot cache
+
+Usage: python -m benchmarks.snapshot_cache [task_count]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+
+from benchmarks.task_memory import make_task_dicts
+from models.task_journal import TaskJournal
+from models.task_model import Task
+from models.snapshot_cache import TaskSnapshotCache
+
+def best_of(runs, function):
+    """Return the fastest of several timed calls, in seconds"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "task_Lists.conf")
+        journal_path = os.path.join(directory, "task_Lists.journal")
+        with open(snapshot_path, "w") as file:
+            json.dump(make_task_dicts(count), file, indent=4)
+
+        journal = TaskJournal(journal_path, snapshot_path)
+        tasks = [Task.from_dict(task_dict) for task_dict in journal.load()]
+        cache = TaskSnapshotCache(os.path.join(directory, "task_Lists.cache"), [snapshot_path, journal_path])
+        cache.save(tasks)
+
+        json_time = best_of(3, lambda: [Task.from_dict(task_dict) for task_dict in journal.load()])
+        cache_time = best_of(3, cache.load)
+        print(f"{count} tasks: JSON {json_time * 1000:.0f} ms, cache {cache_time * 1000:.0f} ms "
+              f"({os.path.getsize(snapshot_path) / 1024 / 1024:.1f} MiB JSON, "
+              f"{os.path.getsize(cache.path) / 1024 / 1024:.1f} MiB cache)")
+
+        # A touched source is re-hashed before the cache is trusted
+        os.utime(snapshot_path)
+        cache = TaskSnapshotCache(cache.path, [snapshot_path, journal_path])
+        print(f"Cache after touching the source: {best_of(1, cache.load) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
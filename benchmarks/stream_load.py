@@ -0,0 +1,99 @@
+"""
+Compare peak memory of loading a large task_Lists.conf in one piece and streamed
+
+Writes a synthetic snapshot of the requested size, then loads it in a fresh
+interpreter per mode so each peak RSS is measured on its own.
+
+Usage: python -m benchmarks.stream_load [--size-mb N] [--path FILE]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import resource
+import tempfile
+import subprocess
+
+from benchmarks.task_memory import make_task_dicts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("full", "stream")
+DETAILS = "Synthetic task details used to give the benchmark file realistic entry sizes. " * 3
+
+def write_snapshot(path, size_mb):
+    """Write task dictionaries to path until it holds about size_mb megabytes"""
+    target = size_mb * 1024 * 1024
+    written = 0
+    count = 0
+    with open(path, "w") as file:
+        file.write("[")
+        while written < target:
+            for task_dict in make_task_dicts(1000):
+                task_dict["id"] = uuid.uuid4().hex
+                task_dict["name"] = f"Task {count}"
+                task_dict["details"] = DETAILS
+                text = ("," if count else "") + "\n    " + json.dumps(task_dict)
+                file.write(text)
+                written += len(text)
+                count += 1
+        file.write("\n]")
+    return count
+
+def measure(mode, path):
+    """Load the snapshot in one mode and return (task count, seconds to first task, seconds, peak MiB)"""
+    from models.task_journal import TaskJournal
+    from models.task_model import Task
+
+    journal = TaskJournal(os.path.join(os.path.dirname(path), "no_journal.log"), path)
+    started = time.perf_counter()
+    first = None
+    tasks = []
+    if mode == "full":
+        # What load_tasks did before: parse everything, then build every Task
+        tasks = [Task.from_dict(task_dict) for task_dict in journal.load()]
+        first = time.perf_counter() - started
+    else:
+        for batch in journal.load_batches(2000):
+            tasks.extend(Task.from_dict(task_dict) for task_dict in batch)
+            if first is None:
+                first = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    return len(tasks), first, elapsed, peak_mib
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--path", help="Use an existing snapshot instead of writing one")
+    parser.add_argument("--measure", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path
+        if not path:
+            path = os.path.join(directory, "task_Lists.conf")
+            count = write_snapshot(path, args.size_mb)
+            print(f"Wrote {count} tasks ({os.path.getsize(path) / 1024 / 1024:.0f} MiB) to {path}")
+
+        results = {}
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.stream_load", "--measure", mode, "--path", path],
+                cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout
+            count, first, elapsed, peak_mib = json.loads(output)
+            results[mode] = peak_mib
+            print(f"{mode:>6}: {count} tasks, first task after {first:.2f} s, "
+                  f"done in {elapsed:.2f} s, peak RSS {peak_mib:.0f} MiB")
+
+    saved = results["full"] - results["stream"]
+    print(f"Streaming peak is {saved:.0f} MiB ({saved / results['full']:.0%}) lower")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure the memory used per Task with tracemalloc
+
+Usage: python -m benchmarks.task_memory [task_count]
+"""
+import sys
+import gc
+import json
+import tracemalloc
+
+from models.task_model import Task
+
+TAGS = ["Work", "Personal", "Meeting", "Development", "Documentation"]
+DAYS = [["Monday"], ["Tuesday", "Thursday"], ["Free"], ["Monday", "Wednesday", "Friday"]]
+STATUSES = ["working", "planned", "closed"]
+
+def make_task_dicts(count):
+    """Build task dictionaries shaped like the ones loaded from task_Lists.conf"""
+    return [
+        {
+            "name": f"Task {index}",
+            "status": STATUSES[index % len(STATUSES)],
+            "days": list(DAYS[index % len(DAYS)]),
+            "details": "",
+            "tags": [TAGS[index % len(TAGS)]],
+            "completed_today": False,
+            "perceived_effort": index % 10,
+            "priority": 1,
+            "recurring": {}
+        }
+        for index in range(count)
+    ]
+
+def measure(count):
+    """Return the traced bytes still held by count tasks loaded from JSON"""
+    text = json.dumps(make_task_dicts(count))
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # Parse like load_tasks does, then keep only what the tasks themselves reference
+    task_dicts = json.loads(text)
+    tasks = [Task.from_dict(task_dict) for task_dict in task_dicts]
+    del task_dicts
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del tasks
+    return used
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    used = measure(count)
+    print(f"{count} tasks: {used / 1024 / 1024:.1f} MiB total, {used / count:.0f} bytes per task")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure build and query time of the trigram text index
+
+Usage: python -m benchmarks.text_search [task_count] [details_words]
+"""
+import sys
+import time
+import random
+
+from models.task_model import Task
+from models.trigram_index import TrigramIndex
+
+TAGS = ["Work", "Personal", "Meeting", "Development", "Documentation"]
+QUERIES = ["meet", "review budget", "deploy", "quarterly planning notes", "xy"]
+
+def make_vocabulary(size, rng):
+    """Build random lower-case words of 3 to 10 letters"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+def make_tasks(count, details_words, rng):
+    """Build tasks with random multi-kilobyte details"""
+    vocabulary = make_vocabulary(20000, rng) + ["meeting", "review", "budget", "deploy",
+                                                "quarterly", "planning", "notes"]
+    return [
+        Task(
+            name=f"Task {index} {rng.choice(vocabulary)}",
+            tags=[TAGS[index % len(TAGS)]],
+            details=" ".join(rng.choice(vocabulary) for _ in range(details_words))
+        )
+        for index in range(count)
+    ]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    details_words = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    rng = random.Random(1)
+    tasks = make_tasks(count, details_words, rng)
+    index = TrigramIndex(lambda: tasks)
+
+    start = time.perf_counter()
+    index.build_in_background()
+    print(f"{count} tasks x {details_words} words: build started in {(time.perf_counter() - start) * 1000:.1f} ms")
+    index.wait_for_build()
+    print(f"  built in the background in {time.perf_counter() - start:.1f} s")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        results = index.search(query, limit=50)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {query!r}: {len(results)} results in {elapsed:.1f} ms")
+
+if __name__ == "__main__":
+    main()
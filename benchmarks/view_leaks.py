@@ -0,0 +1,154 @@
+"""
+Open and close every view many times and check that memory stays bounded
+
+Each view is opened through the controllers the way a click would open it,
+then closed, one cycle per event-loop turn (PyQt releases slot connections
+through deferred deletes, which need a running loop). After a warm-up,
+resident memory, live Python objects and live widgets are sampled; the run
+fails if any of them keeps growing.
+
+Usage: python -m benchmarks.view_leaks [cycles] [task_count]
+"""
+import os
+import gc
+import sys
+import tempfile
+import itertools
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.task_memory import make_task_dicts
+from utils.config import DATA_FILES
+
+WARMUP_CYCLES = 50
+MAX_RSS_GROWTH_MIB = 4
+MAX_OBJECT_GROWTH = 500
+
+def rss_mib():
+    """Current resident set size of this process"""
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+def settle(app):
+    """Run pending deferred deletions and collect garbage"""
+    for _ in range(3):
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        app.processEvents()
+    gc.collect()
+
+def sample(app):
+    settle(app)
+    return rss_mib(), len(gc.get_objects()), len(app.allWidgets())
+
+def close_modal_dialog():
+    """Close the modal dialog a controller is waiting on with exec_()"""
+    dialog = QApplication.activeModalWidget()
+    if dialog is not None:
+        dialog.reject()
+
+def make_openers(controller, model):
+    """Return functions that open and close each view once"""
+    task = model.tasks[0]
+
+    def today_tasks():
+        controller.show_today_task_view()
+        controller.view_cache.cached("today_tasks").close()
+
+    def all_schedule():
+        controller.show_all_schedule_view()
+        controller.view_cache.cached("all_schedule").close()
+
+    def task_detail():
+        QTimer.singleShot(0, close_modal_dialog)
+        controller.task_controller.show_task_detail_view(task, controller.main_view)
+
+    def calculation():
+        tasks = model.get_today_tasks(include_free=True)[:5]
+        for today_task in tasks:
+            today_task.completed_today = True
+        QTimer.singleShot(0, close_modal_dialog)
+        controller.calculation_controller.show_calculation_view(tasks)
+
+    return {"today tasks": today_tasks, "all schedule": all_schedule,
+            "task detail": task_detail, "calculation": calculation}
+
+def wait_for_prewarm(caches):
+    """Yield until the view caches have built their views, which are not leaks"""
+    while any(cache.prewarming for cache in caches):
+        yield
+
+def check_views(app, openers, cycles, results):
+    """Open and close each view repeatedly, yielding after every cycle
+
+    Appends True to results for each view whose memory stayed bounded.
+    """
+    for name, open_and_close in openers.items():
+        for _ in range(WARMUP_CYCLES):
+            open_and_close()
+            yield
+        rss_before, objects_before, widgets_before = sample(app)
+        for _ in range(cycles):
+            open_and_close()
+            yield
+        rss_after, objects_after, widgets_after = sample(app)
+
+        rss_growth = rss_after - rss_before
+        object_growth = objects_after - objects_before
+        widget_growth = widgets_after - widgets_before
+        bounded = (rss_growth <= MAX_RSS_GROWTH_MIB and object_growth <= MAX_OBJECT_GROWTH
+                   and widget_growth <= 0)
+        print(f"{name:>12}: {cycles} cycles, RSS {rss_growth:+.1f} MiB, objects {object_growth:+d}, "
+              f"widgets {widget_growth:+d} -> {'ok' if bounded else 'LEAK'}")
+        results.append(bounded)
+
+def run_in_event_loop(app, steps):
+    """Advance a generator by one step per event-loop turn, then quit the loop"""
+    def step():
+        try:
+            next(steps)
+        except StopIteration:
+            app.quit()
+            return
+        QTimer.singleShot(0, step)
+    QTimer.singleShot(0, step)
+    app.exec_()
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    app = QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the run away from the real schedule files
+        for key, path in DATA_FILES.items():
+            DATA_FILES[key] = os.path.join(directory, os.path.basename(path))
+
+        from models.task_model import Task
+        from models.schedule_model import ScheduleModel
+        from controllers.main_controller import MainController
+        from views.builders.view_builder import MainViewBuilder
+        from views.builders.theme_factory import LightThemeFactory
+
+        model = ScheduleModel()
+        model.tasks = [Task.from_dict(task_dict) for task_dict in make_task_dicts(count)]
+        controller = MainController(model, MainViewBuilder(LightThemeFactory()))
+        controller.show_main_view()
+        observers = model.observer_count
+
+        results = []
+        caches = [controller.view_cache, controller.task_controller.view_cache]
+        run_in_event_loop(app, itertools.chain(wait_for_prewarm(caches),
+                                               check_views(app, make_openers(controller, model), cycles, results)))
+        if model.observer_count != observers:
+            print(f"Observer count grew from {observers} to {model.observer_count}")
+            results.append(False)
+
+        model.close()
+    if not all(results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare the time to open a view the first time (build) and again (rebind)
+
+Usage: python -m benchmarks.view_open [task_count] [reopen_count]
+"""
+import os
+import sys
+import time
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.task_memory import make_task_dicts
+from benchmarks.view_leaks import close_modal_dialog
+from utils.config import DATA_FILES
+
+def timed(function):
+    """Return how long a call took, in milliseconds"""
+    started = time.perf_counter()
+    function()
+    return (time.perf_counter() - started) * 1000
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    reopen_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the run away from the real schedule files
+        for key, path in DATA_FILES.items():
+            DATA_FILES[key] = os.path.join(directory, os.path.basename(path))
+
+        from models.task_model import Task
+        from models.schedule_model import ScheduleModel
+        from controllers.main_controller import MainController
+        from views.builders.view_builder import MainViewBuilder
+        from views.builders.theme_factory import LightThemeFactory
+
+        model = ScheduleModel()
+        model.tasks = [Task.from_dict(task_dict) for task_dict in make_task_dicts(count)]
+        controller = MainController(model, MainViewBuilder(LightThemeFactory()))
+        controller.show_main_view()
+        task = model.tasks[0]
+
+        def show_task_detail():
+            QTimer.singleShot(0, close_modal_dialog)
+            controller.task_controller.show_task_detail_view(task)
+
+        views = {
+            "today tasks": (controller.show_today_task_view, lambda: controller.view_cache.cached("today_tasks")),
+            "all schedule": (controller.show_all_schedule_view, lambda: controller.view_cache.cached("all_schedule")),
+            "task detail": (show_task_detail, lambda: None),
+        }
+        for name, (open_view, cached_view) in views.items():
+            first = timed(open_view)
+            reopens = []
+            for _ in range(reopen_count):
+                view = cached_view()
+                if view is not None:
+                    view.close()
+                app.processEvents()
+                reopens.append(timed(open_view))
+            if cached_view() is not None:
+                cached_view().close()
+            reopens.sort()
+            print(f"{name:>12}: first open {first:.1f} ms, reopen median {reopens[len(reopens) // 2]:.1f} ms")
+
+        model.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 from patterns.strategy import ProportionalTimeCalculation
 from views.calculation_view import CalculationView
-from views.builders.theme_factory import LightThemeFactory
+from views.builders.theme_service import ThemeService
 from datetime import datetime
+from PyQt5.QtCore import Qt
 
 class CalculationController:
     """Controller for handling work time calculations"""
@@ -21,10 +22,8 @@ class CalculationController:
     def save_work_time(self, calculated_tasks):
         """Save calculated work time to configuration file"""
         try:
-            result = self.model.save_work_time(calculated_tasks)
-            # Notify observers after saving
-            self.model.notify()
-            return result
+            # The model notifies observers with a WORK_TIME_SAVED event
+            return self.model.save_work_time(calculated_tasks)
         except Exception as e:
             print(f"Error saving work time: {e}")
             return False
@@ -35,7 +34,8 @@ class CalculationController:
         if not all(task.completed_today for task in tasks):
             return False
         
-        theme_factory = LightThemeFactory()
-        view = CalculationView(theme_factory, tasks, self)
+        view = CalculationView(ThemeService.instance().factory, tasks, self)
+        # Deleted once closed, so its widgets and connected slots are released
+        view.setAttribute(Qt.WA_DeleteOnClose)
         view.exec_()  # Use exec_ to make it modal
         return True
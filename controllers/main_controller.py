@@ -5,13 +5,15 @@ import traceback
 import logging
 
 from patterns.command import Command, OpenViewCommand
-from patterns.observer import Observer
+from patterns.observer import Observer, ChangeEvent
 from views.builders.view_builder import Director, TodayTaskViewBuilder, AllScheduleViewBuilder
-from views.builders.theme_factory import LightThemeFactory, DarkThemeFactory, AbstractThemeFactory
+from views.builders.theme_service import ThemeService
 from controllers.task_controller import TaskController
 from controllers.calculation_controller import CalculationController
+from controllers.model_loader import ModelLoader
+from controllers.refresh_scheduler import RefreshScheduler
+from controllers.view_cache import ViewCache
 from utils.error_handler import ErrorHandler
-from utils.excel_exporter import ExcelExporter
 from utils.config import UI_THEME  # Fixed import statement
 
 class MainController(Observer):
@@ -20,6 +22,15 @@ class MainController(Observer):
     def __init__(self, model, view_builder):
         self.model = model
         self.model.attach(self)
+        self._loading = False
+        self._pending_actions = []  # Actions requested before the model finished loading
+        self._loader = None
+        self.refresh_scheduler = RefreshScheduler()
+        
+        # Subsidiary views are built once and rebound to current data when reopened
+        self.view_cache = ViewCache()
+        self.view_cache.register("today_tasks", self.build_today_task_view)
+        self.view_cache.register("all_schedule", self.build_all_schedule_view)
         
         try:
             # Create main view
@@ -32,12 +43,18 @@ class MainController(Observer):
             
             # Set the task controller in main view for task details
             self.main_view.set_task_detail_controller(self.task_controller)
+            self.refresh_scheduler.register(self.main_view, self.refresh_main_view, self.refresh_main_rows)
             
             # Connect UI signals to commands
             self.connect_signals()
             
-            # Initialize view with current data
+            # Initialize view with current data, or a loading state until it arrives
             self.refresh_main_view()
+            if not self.model.loaded:
+                self._loading = True
+                self.main_view.set_loading(True)
+            else:
+                self.prewarm_views()
         except Exception as e:
             ErrorHandler.handle_error(e)
             traceback.print_exc()
@@ -48,40 +65,99 @@ class MainController(Observer):
         # Main view buttons
         try:
             self.main_view.today_task_button.clicked.connect(
-                lambda: OpenViewCommand(self, "show_today_task_view").execute()
+                lambda: self.when_loaded(OpenViewCommand(self, "show_today_task_view").execute)
             )
             self.main_view.all_schedule_button.clicked.connect(
-                lambda: OpenViewCommand(self, "show_all_schedule_view").execute()
+                lambda: self.when_loaded(OpenViewCommand(self, "show_all_schedule_view").execute)
             )
             self.main_view.calculate_button.clicked.connect(
-                lambda: OpenViewCommand(self, "show_calculation_view").execute()
+                lambda: self.when_loaded(OpenViewCommand(self, "show_calculation_view").execute)
             )
             if hasattr(self.main_view, 'excel_export_button'):
                 self.main_view.excel_export_button.clicked.connect(
-                    self.export_to_excel
+                    lambda: self.when_loaded(self.export_to_excel)
                 )
         except Exception as e:
             ErrorHandler.handle_error(e)
             traceback.print_exc()
     
-    def update(self, subject):
-        """Observer pattern update method - Controller receives model updates"""
+    def when_loaded(self, action):
+        """Run an action that needs task data now, or queue it until the model is loaded"""
+        if self.model.loaded:
+            action()
+        else:
+            self._pending_actions.append(action)
+    
+    def load_model_in_background(self):
+        """Stream the stored schedule into the model; the views fill in batch by batch"""
+        if self.model.loaded or self._loader is not None:
+            return
+        self._loader = ModelLoader(self.model)
+        self._loader.progress.connect(self.main_view.show_loading_progress)
+        self._loader.start()
+    
+    def model_loaded(self):
+        """Leave the loading state and run the actions queued while loading"""
+        self._loading = False
+        self.main_view.set_loading(False)
+        actions, self._pending_actions = self._pending_actions, []
+        for action in actions:
+            action()
+        self.prewarm_views()
+    
+    def prewarm_views(self):
+        """Build the subsidiary views in the background so opening them is only a rebind"""
+        self.view_cache.prewarm()
+        self.task_controller.prewarm_views()
+    
+    # Event kinds that can change which rows the views show
+    STRUCTURAL_EVENTS = {ChangeEvent.CHANGED, ChangeEvent.TASK_ADDED, ChangeEvent.TASK_REMOVED,
+                         ChangeEvent.TASKS_RELOADED, ChangeEvent.TODAY_TASKS_SAVED}
+    
+    def update(self, subject, events):
+        """Observer pattern update method - Controller receives model change events"""
         if subject == self.model:
             try:
-                # Refresh main view
-                self.refresh_main_view()
+                kinds = {event.kind for event in events}
+                updated_ids = [event.task_id for event in events if event.kind == ChangeEvent.TASK_UPDATED]
                 
-                # Also update any open subsidiary views
-                if hasattr(self, '_all_schedule_view') and self._all_schedule_view.isVisible():
-                    self.task_controller.refresh_all_schedule_view(self._all_schedule_view)
-                    
-                if hasattr(self, '_today_task_view') and self._today_task_view.isVisible():
-                    self.task_controller.refresh_today_task_view(self._today_task_view)
+                # A change of days moves tasks in or out of today's list
+                if kinds & self.STRUCTURAL_EVENTS or any("days" in event.fields for event in events):
+                    self.refresh_all_views()
+                    if self._loading and self.model.loaded:
+                        self.model_loaded()
+                    return
+                
+                if ChangeEvent.TAGS_CHANGED in kinds:
+                    self.refresh_tags()
+                if updated_ids:
+                    self.refresh_task_rows(updated_ids)
                     
             except Exception as e:
                 print(f"Error updating views: {e}")
                 traceback.print_exc()
     
+    def refresh_all_views(self):
+        """Mark the main view and any open subsidiary views for a full redraw"""
+        self.refresh_scheduler.mark_dirty()
+    
+    def refresh_task_rows(self, task_ids):
+        """Mark the rows of the given tasks for a redraw in every open view"""
+        self.refresh_scheduler.mark_dirty(rows=task_ids)
+    
+    def refresh_tags(self):
+        """Mark the tag lists of open views for a redraw"""
+        self.refresh_scheduler.mark_dirty(tags=True)
+    
+    def tasks_for_ids(self, task_ids):
+        """Return the tasks with the given ids that still exist"""
+        return [task for task in (self.model.get_task(task_id) for task_id in task_ids) if task]
+    
+    def refresh_main_rows(self, task_ids):
+        """Redraw only the rows of the given tasks in the main view"""
+        self.main_view.update_task_rows(self.tasks_for_ids(task_ids))
+        self.main_view.update_calculate_button(self.model.get_today_tasks(include_free=True))
+    
     def refresh_main_view(self):
         """Refresh the main view with current model data"""
         try:
@@ -97,24 +173,47 @@ class MainController(Observer):
         """Show the main application window"""
         self.main_view.show()
     
+    def build_today_task_view(self):
+        """Build the today's task view and register its refreshes"""
+        builder = TodayTaskViewBuilder(ThemeService.instance().factory)
+        view = Director(builder).construct()
+        view.set_controller(self.task_controller)
+        
+        # Redraws follow model changes while the view is exposed
+        self.refresh_scheduler.register(
+            view,
+            lambda: self.task_controller.refresh_today_task_view(view),
+            lambda task_ids: view.update_task_rows(self.tasks_for_ids(task_ids)),
+            lambda: (view.set_tags(self.model.tags.copy()), view.update_tags_combo())
+        )
+        return view
+    
+    def build_all_schedule_view(self):
+        """Build the all schedule view and register its refreshes"""
+        builder = AllScheduleViewBuilder(ThemeService.instance().factory)
+        view = Director(builder).construct()
+        view.set_controller(self.task_controller)
+        
+        # Redraws follow model changes while the view is exposed
+        self.refresh_scheduler.register(
+            view,
+            lambda: self.task_controller.refresh_all_schedule_view(view),
+            lambda task_ids: view.update_task_rows(self.tasks_for_ids(task_ids)),
+            lambda: view.set_tags(self.model.tags.copy())
+        )
+        return view
+    
     def show_today_task_view(self):
         """Show the today's task view"""
         try:
-            theme_factory = LightThemeFactory()
-            builder = TodayTaskViewBuilder(theme_factory)
-            director = Director(builder)
-            view = director.construct()
-            
-            # Set up view with controller and data
-            view.set_controller(self.task_controller)
-            view.set_tags(self.model.tags)
-            
-            # Connect a signal when the dialog is accepted/closed
-            view.finished.connect(lambda result: self.model.notify())
-            
-            # Store reference to prevent garbage collection
-            self._today_task_view = view
-            view.show()
+            view = self.view_cache.get("today_tasks")
+            if not view.isVisible():
+                # Start over as a newly built view would, with the current data
+                view.reset_state()
+                view.set_controller(self.task_controller)
+                view.set_tags(self.model.tags)
+                self.refresh_scheduler.mark_clean(view)
+            self.present_view(view)
         except Exception as e:
             QMessageBox.critical(self.main_view, "Error", f"Failed to open Today's Task view: {str(e)}")
             print(f"Error showing today task view: {e}")
@@ -123,28 +222,27 @@ class MainController(Observer):
     def show_all_schedule_view(self):
         """Show the all schedule view"""
         try:
-            theme_factory = LightThemeFactory()
-            builder = AllScheduleViewBuilder(theme_factory)
-            director = Director(builder)
-            view = director.construct()
-            
-            # Set up view with controller and data through controller
-            view.set_controller(self.task_controller)
-            
-            # Refresh view with data from the controller
-            self.task_controller.refresh_all_schedule_view(view)
-            
-            # Connect to model updates
-            # Store reference to the view for later refresh
-            self._all_schedule_view = view
-            
-            # Show the view
-            view.show()
+            view = self.view_cache.get("all_schedule")
+            if not view.isVisible():
+                # Rebind to the current data instead of building a new view
+                view.reset_state()
+                self.task_controller.refresh_all_schedule_view(view)
+                self.refresh_scheduler.mark_clean(view)
+            self.present_view(view)
         except Exception as e:
             QMessageBox.critical(self.main_view, "Error", f"Failed to open All Schedule view: {str(e)}")
             print(f"Error showing all schedule view: {e}")
             traceback.print_exc()
     
+    def present_view(self, view):
+        """Show a view, bringing it to the front if it is already open"""
+        if view.isMinimized():
+            view.showNormal()
+        else:
+            view.show()
+        view.raise_()
+        view.activateWindow()
+    
     def show_calculation_view(self):
         """Show the calculation view if all tasks are completed"""
         try:
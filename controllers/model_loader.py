@@ -0,0 +1,73 @@
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class _LoadSignals(QObject):
+    """Signals of a load job; emitted on the worker thread, delivered on the UI thread"""
+    batch_read = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+class _LoadJob(QRunnable):
+    """Reads the stored schedule on a thread pool worker, one batch of tasks at a time"""
+
+    def __init__(self, model, signals):
+        super().__init__()
+        self.model = model
+        self.signals = signals
+
+    def run(self):
+        try:
+            for tasks in self.model.read_stored_batches():
+                self.signals.batch_read.emit(tasks)
+            tags = self.model.read_stored_tags()
+        except Exception as e:
+            self.signals.failed.emit(e)
+            return
+        self.signals.finished.emit(tags)
+
+class ModelLoader(QObject):
+    """Hydrates a ScheduleModel created with load=False in the background"""
+
+    progress = pyqtSignal(int)  # Number of tasks loaded so far
+    finished = pyqtSignal()
+
+    def __init__(self, model, thread_pool=None, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.loaded_count = 0
+        self._signals = None
+        self._started = None
+
+    def start(self):
+        """Start reading the schedule; observers are notified as each batch is applied"""
+        if self._signals is not None:
+            return
+        self._started = time.perf_counter()
+        self._signals = _LoadSignals()
+        self._signals.batch_read.connect(self._apply_batch)
+        self._signals.finished.connect(self._finish)
+        self._signals.failed.connect(self._fail)
+        self.thread_pool.start(_LoadJob(self.model, self._signals))
+
+    def _apply_batch(self, tasks):
+        if self.loaded_count == 0:
+            elapsed_ms = (time.perf_counter() - self._started) * 1000
+            logging.info(f"First {len(tasks)} tasks available after {elapsed_ms:.1f} ms")
+        self.model.append_stored_tasks(tasks)
+        self.loaded_count += len(tasks)
+        self.progress.emit(self.loaded_count)
+
+    def _finish(self, tags):
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        logging.info(f"Read {self.loaded_count} tasks in the background in {elapsed_ms:.1f} ms")
+        self.model.finish_loading(tags)
+        self.finished.emit()
+
+    def _fail(self, error):
+        logging.error(f"Error loading tasks: {error}", exc_info=error)
+        # Same fallback as a synchronous load: start with an empty schedule, and drop the cache
+        self.model.fail_loading()
+        self.finished.emit()
@@ -0,0 +1,132 @@
+import logging
+
+from PyQt5.QtCore import QObject, QEvent, QTimer
+
+class _ViewEntry:
+    """Refresh callbacks of a registered view and the work pending for it"""
+
+    __slots__ = ("view", "refresh", "refresh_rows", "refresh_tags", "full", "rows", "tags", "window")
+
+    def __init__(self, view, refresh, refresh_rows, refresh_tags):
+        self.view = view
+        self.refresh = refresh
+        self.refresh_rows = refresh_rows
+        self.refresh_tags = refresh_tags
+        self.full = False
+        self.rows = set()
+        self.tags = False
+        self.window = None
+
+    @property
+    def pending(self):
+        return self.full or bool(self.rows) or self.tags
+
+class RefreshScheduler(QObject):
+    """Redraws views marked dirty at most once per event-loop turn, and only while they are exposed
+
+    Views that are hidden, minimized or covered keep their pending work and
+    catch up when they are shown or exposed again.
+    """
+
+    # Window events after which a view may have become exposed
+    EXPOSE_EVENTS = (QEvent.Show, QEvent.WindowStateChange, QEvent.Expose)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = {}  # id(view) -> _ViewEntry
+        self._windows = {}  # id(window handle) -> id(view)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def register(self, view, refresh, refresh_rows=None, refresh_tags=None):
+        """Manage a view's refreshes
+
+        refresh() redraws the whole view; refresh_rows(task_ids) and
+        refresh_tags() are cheaper partial updates used when available.
+        """
+        key = id(view)
+        self._entries[key] = _ViewEntry(view, refresh, refresh_rows, refresh_tags)
+        view.installEventFilter(self)
+        view.destroyed.connect(lambda *args, key=key: self._forget(key))
+
+    def unregister(self, view):
+        """Stop managing a view, dropping its pending work"""
+        entry = self._entries.get(id(view))
+        if entry is not None:
+            view.removeEventFilter(self)
+            if entry.window is not None:
+                entry.window.removeEventFilter(self)
+            self._forget(id(view))
+
+    def mark_dirty(self, view=None, rows=(), tags=False):
+        """Record that one view, or every view, needs a redraw
+
+        Without rows or tags the whole view is redrawn; otherwise only the rows
+        of the given task ids and/or the tag list.
+        """
+        entries = [self._entries[id(view)]] if view is not None and id(view) in self._entries \
+            else [] if view is not None else list(self._entries.values())
+        for entry in entries:
+            if not rows and not tags:
+                entry.full = True
+            elif not entry.full:
+                entry.rows.update(rows)
+                entry.tags = entry.tags or tags
+        if entries:
+            self._timer.start()
+
+    def mark_clean(self, view):
+        """Drop the work pending for a view, e.g. after it was rebound to current data"""
+        entry = self._entries.get(id(view))
+        if entry is not None:
+            entry.full, entry.rows, entry.tags = False, set(), False
+
+    def flush(self):
+        """Redraw every exposed view with pending work"""
+        for entry in list(self._entries.values()):
+            if entry.pending and self.is_exposed(entry.view):
+                try:
+                    self._refresh(entry)
+                except Exception as e:
+                    # Runs from a timer slot, where an escaping exception would abort the application
+                    logging.error(f"Error refreshing {type(entry.view).__name__}: {e}", exc_info=True)
+
+    @staticmethod
+    def is_exposed(view):
+        """Whether a view is on screen: visible, not minimized and not fully covered"""
+        if not view.isVisible() or view.isMinimized():
+            return False
+        window = view.windowHandle()
+        return window is None or window.isExposed()
+
+    def _refresh(self, entry):
+        full, rows, tags = entry.full, entry.rows, entry.tags
+        entry.full, entry.rows, entry.tags = False, set(), False
+        if full or (rows and entry.refresh_rows is None) or (tags and entry.refresh_tags is None):
+            entry.refresh()
+            return
+        if rows:
+            entry.refresh_rows(list(rows))
+        if tags:
+            entry.refresh_tags()
+
+    def _forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.window is not None:
+            self._windows.pop(id(entry.window), None)
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.EXPOSE_EVENTS:
+            key = self._windows.get(id(obj), id(obj))
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.window is None and entry.view.windowHandle() is not None:
+                    # Expose events go to the native window rather than the widget
+                    entry.window = entry.view.windowHandle()
+                    entry.window.installEventFilter(self)
+                    self._windows[id(entry.window)] = key
+                if entry.pending:
+                    self._timer.start()
+        return super().eventFilter(obj, event)
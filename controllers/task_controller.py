@@ -3,7 +3,7 @@ from patterns.strategy import TaskFilterStrategy, TodayTasksFilter
 from models.task_model import Task
 from patterns.state import StateContext
 from PyQt5.QtWidgets import QMessageBox
-import datetime
+from controllers.view_cache import ViewCache
 
 class TaskController:
     """Controller for task-related operations"""
@@ -11,6 +11,10 @@ class TaskController:
     def __init__(self, model):
         self.model = model
         self.current_filter_strategy = TodayTasksFilter()
+        
+        # The detail dialog is built once and rebound to the task being shown
+        self.view_cache = ViewCache()
+        self.view_cache.register("task_detail", self.build_task_detail_view)
     
     def set_filter_strategy(self, strategy):
         """Set the strategy for filtering tasks"""
@@ -21,7 +25,7 @@ class TaskController:
     
     def get_filtered_tasks(self):
         """Get tasks filtered by the current strategy"""
-        return self.current_filter_strategy.filter(self.model.tasks)
+        return self.current_filter_strategy.filter_model(self.model)
     
     def add_task(self, task):
         """Add a new task to the model"""
@@ -37,9 +41,7 @@ class TaskController:
     
     def update_task(self, task, attributes):
         """Update task attributes"""
-        for key, value in attributes.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
+        self.model.update_task(task, attributes)
         
         # Handle state transitions if status changes
         if 'status' in attributes:
@@ -48,7 +50,6 @@ class TaskController:
             properties = state.get_display_properties()
             # The properties could be used to update UI elements
         
-        self.model.notify()
         return True
     
     def save_tasks(self):
@@ -56,33 +57,74 @@ class TaskController:
         self.model.save_tasks()
         return True
     
+    def get_tasks_changed_since(self, since):
+        """Get tasks modified at or after a datetime or timestamp string"""
+        return self.model.get_tasks_changed_since(since)
+    
+    def flush_pending_writes(self):
+        """Write scheduled saves to disk now"""
+        self.model.flush_pending_writes()
+    
     def add_tag(self, tag):
         """Add a new tag"""
         self.model.add_tag(tag)
-        self.model.save_tags()
     
-    def delete_tag(self, tag):
-        """Delete a tag"""
-        self.model.delete_tag(tag)
-        self.model.save_tags()
+    def delete_tag(self, tag, cascade=False):
+        """Delete a tag, optionally removing it from every task"""
+        self.model.delete_tag(tag, cascade=cascade)
+    
+    def rename_tag(self, old_tag, new_tag):
+        """Rename a tag on the tag list and on its tasks"""
+        self.model.rename_tag(old_tag, new_tag)
+    
+    def merge_tags(self, source_tags, target_tag):
+        """Merge tags into a single tag"""
+        self.model.merge_tags(source_tags, target_tag)
+    
+    def apply_tag_operations(self, operations):
+        """Apply a sequence of tag edits as one change
+        
+        Each operation is a tuple: ("add", tag), ("rename", old, new),
+        ("merge", source, target) or ("delete", tag).
+        """
+        with self.model.batch():
+            for operation in operations:
+                action = operation[0]
+                if action == "add":
+                    self.add_tag(operation[1])
+                elif action == "rename":
+                    self.rename_tag(operation[1], operation[2])
+                elif action == "merge":
+                    self.merge_tags([operation[1]], operation[2])
+                elif action == "delete":
+                    self.delete_tag(operation[1], cascade=True)
+    
+    def count_tasks_with_tag(self, tag):
+        """Count the tasks carrying a tag"""
+        return len(self.model.get_tasks_with_tag(tag))
     
     def create_new_task(self, name="", status="planned", days=None, details="", tags=None):
         """Create a new task with the given attributes"""
         return Task(name=name, status=status, days=days if days else ["Free"], 
                     details=details, tags=tags if tags else [])
     
-    def show_task_detail_view(self, task, parent=None):
-        """Show a detail view for the given task"""
+    def build_task_detail_view(self):
+        """Build the task detail dialog, not yet bound to a task"""
         from views.task_detail_view import TaskDetailView
-        from views.builders.theme_factory import LightThemeFactory
-        
-        theme_factory = LightThemeFactory()
-        detail_view = TaskDetailView(theme_factory, task, self)
-        result = detail_view.exec_()
+        from views.builders.theme_service import ThemeService
         
-        # If the dialog was accepted, notify model observers
-        if result == detail_view.Accepted:
-            self.model.notify()
+        return TaskDetailView(ThemeService.instance().factory, controller=self)
+    
+    def prewarm_views(self):
+        """Build this controller's dialogs in the background so opening them is only a rebind"""
+        self.view_cache.prewarm()
+    
+    def show_task_detail_view(self, task, parent=None):
+        """Show a detail view for the given task"""
+        detail_view = self.view_cache.get("task_detail")
+        detail_view.bind_task(task)
+        # Saving goes through update_task, which already notifies the model observers
+        detail_view.exec_()
         
         return True
 
@@ -94,12 +136,10 @@ class TaskController:
             include_free: If True, include Free tasks in results
             auto_add_only_today: If True, only return tasks for today's day (for auto-adding)
         """
-        today = datetime.datetime.now().strftime("%A")
-        
         if auto_add_only_today:
             # For automatic addition, only get tasks scheduled specifically for today
             # Explicitly exclude Free tasks for auto-adding
-            return [task for task in self.model.tasks if today in task.days and "Free" not in task.days]
+            return self.model.get_today_tasks(include_free=False, exclude_free=True)
         else:
             # Normal behavior - get today's tasks + optional Free tasks
             return self.model.get_today_tasks(include_free=include_free)
@@ -116,20 +156,39 @@ class TaskController:
         print(f"Saving today's tasks: {task_names}")
         
         # Save all provided tasks without filtering
-        result = self.model.save_today_tasks(tasks)
+        with self.model.batch():
+            result = self.model.save_today_tasks(tasks)
+            
+            if result:
+                # Make sure to save to the main task list too for consistency
+                self.save_tasks()
         
         if result:
-            # Make sure to save to the main task list too for consistency
-            self.save_tasks()
-            
-            # Make sure the model notifies all observers of the change
-            self.model.notify()
-            
             return True
         else:
             print("Failed to save today's tasks")
             return False
     
+    def search_tasks(self, query, limit=None):
+        """Get tasks matching a full-text query, best matches first"""
+        return self.model.search(query, limit)
+    
+    def text_search_ready(self):
+        """Whether the full-text index has been built, so searches are complete"""
+        return self.model.text_search_ready()
+    
+    def find_pickable_tasks(self, query, include_other_days=False, exclude_ids=(), limit=50):
+        """Fuzzy-match tasks that can be added to today's list"""
+        return self.model.find_pickable_tasks(query, include_other_days, exclude_ids, limit)
+    
+    def get_task(self, task_id):
+        """Get a task by its id"""
+        return self.model.get_task(task_id)
+    
+    def search_task_ids(self, query):
+        """Get ids of tasks matching a search query"""
+        return self.model.search_task_ids(query)
+    
     def get_all_tasks(self):
         """Get all tasks from the model"""
         return self.model.tasks.copy()
@@ -160,9 +219,9 @@ class TaskController:
             auto_tasks = self.get_today_tasks(include_free=False, auto_add_only_today=True)
             
             # Check for tasks to auto-add (that aren't already in the list)
-            current_task_names = {task.name for task in current_tasks}
+            current_task_ids = {task.id for task in current_tasks}
             for task in auto_tasks:
-                if task.name not in current_task_names:
+                if task.id not in current_task_ids:
                     current_tasks.append(task)
             
             # Update view with both preserved and auto-added tasks
@@ -0,0 +1,72 @@
+import logging
+from functools import partial
+
+from PyQt5.QtCore import QTimer
+
+class ViewCache:
+    """Builds each registered view once and hands out the same instance afterwards
+
+    Views are closed by hiding them, so reopening one only rebinds it to the
+    current data. prewarm() builds views ahead of time, one per event-loop turn.
+    """
+
+    # Pause between building views while prewarming, so input is handled in between
+    PREWARM_INTERVAL_MS = 50
+
+    def __init__(self):
+        self._builders = {}  # View name -> callable returning a newly built view
+        self._views = {}  # View name -> built view
+        self._prewarm_queue = []
+
+    def register(self, name, build):
+        """Register how to build a view"""
+        self._builders[name] = build
+
+    def get(self, name):
+        """Return the view, building it on first use"""
+        view = self._views.get(name)
+        if view is None:
+            view = self._build(name)
+        return view
+
+    def cached(self, name):
+        """Return the view if it has been built, else None"""
+        return self._views.get(name)
+
+    @property
+    def prewarming(self):
+        """Whether views are still queued to be built in the background"""
+        return bool(self._prewarm_queue)
+
+    def prewarm(self, names=None):
+        """Build the given views, or all registered ones, in later event-loop turns"""
+        idle = not self._prewarm_queue
+        self._prewarm_queue.extend(name for name in (names or self._builders)
+                                   if name not in self._views and name not in self._prewarm_queue)
+        if idle and self._prewarm_queue:
+            QTimer.singleShot(self.PREWARM_INTERVAL_MS, self._prewarm_next)
+
+    def _prewarm_next(self):
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if name in self._views:
+                continue
+            try:
+                self._build(name)
+            except Exception as e:
+                # Runs from a timer slot; the view is built on first use instead
+                logging.error(f"Error prewarming view {name}: {e}", exc_info=True)
+            break
+        if self._prewarm_queue:
+            QTimer.singleShot(self.PREWARM_INTERVAL_MS, self._prewarm_next)
+
+    def _build(self, name):
+        view = self._builders[name]()
+        self._views[name] = view
+        view.destroyed.connect(partial(self._forget, name, id(view)))
+        return view
+
+    def _forget(self, name, view_id, *args):
+        view = self._views.get(name)
+        if view is not None and id(view) == view_id:
+            del self._views[name]
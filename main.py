@@ -1,20 +1,40 @@
+import time
+_PROCESS_START = time.perf_counter()  # Taken before the heavy imports, for --profile-startup
+
 import sys
+import argparse
 from PyQt5.QtWidgets import QApplication, QMessageBox
 
 from utils.config import UI_THEME
 from utils.error_handler import ErrorHandler
+from utils.startup_profiler import StartupProfiler
 from controllers.main_controller import MainController
 from models.schedule_model import ScheduleModel
 from views.builders.view_builder import MainViewBuilder
-from views.builders.theme_factory import AbstractThemeFactory
+from views.builders.theme_service import ThemeService
+
+def parse_args(argv):
+    """Parse the application's own options, leaving the rest for Qt"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Log startup phase times and write a JSON report to the log directory")
+    parser.add_argument("--profile-cprofile", action="store_true",
+                        help="With --profile-startup, also write cProfile stats of the startup")
+    return parser.parse_known_args(argv[1:])[0]
 
 def main():
     """Application entry point"""
     try:
+        args = parse_args(sys.argv)
+        profiler = StartupProfiler(args.profile_startup, _PROCESS_START, args.profile_cprofile)
+        profiler.mark("imports")
+        
         # Set up logging
-        logger = ErrorHandler.setup_logging()
+        with profiler.phase("setup_logging"):
+            logger = ErrorHandler.setup_logging()
         
-        app = QApplication(sys.argv)
+        with profiler.phase("create_application"):
+            app = QApplication(sys.argv)
         
         # Exception hook to catch unhandled exceptions
         def exception_hook(exctype, value, traceback):
@@ -23,18 +43,27 @@ def main():
         
         sys.excepthook = exception_hook
         
-        # Initialize model
-        model = ScheduleModel()
+        # Initialize model; the stored schedule is read in the background once the window is up
+        with profiler.phase("create_model"):
+            model = ScheduleModel(load=False)
         
-        # Set up view with builder and abstract factory patterns
-        theme_factory = AbstractThemeFactory.create_theme_factory(UI_THEME)
-        view_builder = MainViewBuilder(theme_factory)
+        # Compile the theme once and apply it application-wide; views are built from its factory
+        with profiler.phase("create_theme"):
+            theme_service = ThemeService.instance()
+            theme_service.apply(UI_THEME)
+            view_builder = MainViewBuilder(theme_service.factory)
         
         # Initialize controller
-        controller = MainController(model, view_builder)
+        with profiler.phase("construct_views"):
+            controller = MainController(model, view_builder)
         
         # Show main window and start app
-        controller.show_main_view()
+        profiler.watch_first_paint(controller.main_view)
+        with profiler.phase("show_main_view"):
+            controller.show_main_view()
+        
+        controller.load_model_in_background()
+        app.aboutToQuit.connect(model.close)
         
         sys.exit(app.exec_())
         
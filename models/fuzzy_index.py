@@ -0,0 +1,100 @@
+"""
+Bigram index over task names for fuzzy type-ahead matching
+"""
+import heapq
+from patterns.observer import Observer, ChangeEvent
+
+def bigrams(text):
+    """Get the set of two-character substrings of a text"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+class FuzzyNameIndex(Observer):
+    """Lower-cased task names indexed by bigram, kept in step through change events"""
+
+    EVENTS = (ChangeEvent.TASK_ADDED, ChangeEvent.TASK_REMOVED,
+              ChangeEvent.TASK_UPDATED, ChangeEvent.TASKS_RELOADED)
+
+    # Share of the query's bigrams a name must contain to count as a match
+    MIN_OVERLAP = 0.5
+
+    def __init__(self):
+        self._names = {}  # Task id -> lower-cased name
+        self._bigrams = {}  # Bigram -> task ids whose name contains it
+
+    def update(self, subject, events):
+        """Apply model change events to the index"""
+        for event in events:
+            if event.kind == ChangeEvent.TASKS_RELOADED:
+                self.rebuild(subject.tasks)
+            elif event.kind == ChangeEvent.TASK_REMOVED:
+                self.remove(event.task_id)
+            elif event.kind == ChangeEvent.TASK_ADDED or (
+                    event.kind == ChangeEvent.TASK_UPDATED and "name" in event.fields):
+                task = subject.get_task(event.task_id)
+                if task is not None:
+                    self.add(task)
+
+    def rebuild(self, tasks):
+        """Index the given tasks, replacing everything indexed before"""
+        self._names = {}
+        self._bigrams = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task):
+        """Index a task's name, or re-index it after a rename"""
+        self.remove(task.id)
+        name = task.name.lower()
+        self._names[task.id] = name
+        for gram in bigrams(name):
+            self._bigrams.setdefault(gram, set()).add(task.id)
+
+    def remove(self, task_id):
+        """Drop a task from the index"""
+        name = self._names.pop(task_id, None)
+        if name is None:
+            return
+        for gram in bigrams(name):
+            ids = self._bigrams.get(gram)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._bigrams[gram]
+
+    def rank(self, query, accept, limit):
+        """Get up to limit task ids whose names match the query, best first
+
+        accept is called with a task id and decides whether the task is eligible.
+        Prefix matches rank first, then substring matches, then names sharing
+        most of the query's bigrams (which tolerates typos and transpositions).
+        """
+        query = query.strip().lower()
+        names = self._names
+        grams = bigrams(query)
+        if not grams:
+            # A single character: plain substring match over the names
+            scored = ((self._score(names[task_id], query, 0.0), task_id)
+                      for task_id in names if query in names[task_id] and accept(task_id))
+            return [task_id for _, task_id in heapq.nlargest(limit, scored)]
+
+        counts = {}
+        for gram in grams:
+            for task_id in self._bigrams.get(gram, ()):
+                counts[task_id] = counts.get(task_id, 0) + 1
+
+        minimum = len(grams) * self.MIN_OVERLAP
+        scored = ((self._score(names[task_id], query, count / len(grams)), task_id)
+                  for task_id, count in counts.items()
+                  if count >= minimum and accept(task_id))
+        return [task_id for _, task_id in heapq.nlargest(limit, scored)]
+
+    @staticmethod
+    def _score(name, query, overlap):
+        if name.startswith(query):
+            bonus = 2.0
+        elif query in name:
+            bonus = 1.0
+        else:
+            bonus = 0.0
+        # Shorter names win ties, as they are closer to what was typed
+        return bonus + overlap - len(name) / 1000.0
@@ -0,0 +1,69 @@
+"""
+Incremental parsing of large JSON arrays without loading the whole file
+"""
+import re
+import json
+
+CHUNK_SIZE = 1 << 20  # Characters read from the file at a time
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+def iter_json_array(file, chunk_size=CHUNK_SIZE):
+    """Yield the elements of the JSON array in a text file one at a time
+
+    Only the current chunk and the element being decoded are held in memory.
+    Raises ValueError when the file does not hold a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    at_eof = False
+
+    def read_more():
+        nonlocal buffer, position, at_eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            at_eof = True
+        # Drop what has been consumed; slicing only here keeps the cost per chunk, not per element
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def next_char():
+        """Skip whitespace and return the next character, or "" at the end of the file"""
+        nonlocal position
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position < len(buffer) or at_eof:
+                return buffer[position:position + 1]
+            read_more()
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array")
+    position += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if at_eof:
+                    raise
+                read_more()  # The element continues in the next chunk
+                continue
+            if not at_eof and (_WHITESPACE.match(buffer, end).end() == len(buffer) or len(buffer) - end <= 2):
+                # A number cut at the chunk boundary ("12", "1.", "1e+") decodes too early
+                read_more()
+                continue
+            break
+        position = end
+        yield value
+
+        separator = next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+        position += 1
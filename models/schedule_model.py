@@ -1,108 +1,455 @@
-import os
-import json
 import datetime
 import logging
-from .task_model import Task
-from patterns.observer import Subject
-from utils.config import DATA_FILES
+from itertools import islice
+from .task_model import Task, current_day_name, format_timestamp
+from .storage import create_storage
+from .search_index import SearchIndex
+from .trigram_index import TrigramIndex
+from .fuzzy_index import FuzzyNameIndex
+from .write_behind import WriteBehindSaver, atomic_write_json
+from patterns.observer import Subject, ChangeEvent
+from utils.config import DATA_FILES, AUTOSAVE_DELAY_SECONDS
 
 class ScheduleModel(Subject):
     """Model representing the schedule containing tasks"""
     
-    def __init__(self):
+    MIN_TEXT_QUERY_LENGTH = 3
+    
+    # Tasks handed to the views at a time while the schedule streams in
+    LOAD_BATCH_SIZE = 2000
+    
+    def __init__(self, storage=None, load=True):
         Subject.__init__(self)
-        self.tasks = []
+        self._tasks_by_id = {}  # Task id -> Task, in schedule order
+        self._task_list = None
+        self._task_order = {}  # Task id -> position counter, for ordering bucket results
+        self._next_order = 0
+        self._day_buckets = {}  # Day name (including "Free") -> {task id: Task}
+        self._tag_index = {}  # Tag -> {task id: Task}
         self.tags = ["Work", "Personal", "Meeting", "Development", "Documentation"]
-        self.load_tasks()
-        self.load_tags()
+        self.storage = storage or create_storage()
+        self.snapshot_cache = self.storage.snapshot_cache
+        
+        # File writes are coalesced and run on a background thread
+        self.saver = WriteBehindSaver(AUTOSAVE_DELAY_SECONDS)
+        self.storage.saver = self.saver
+        
+        # Attached first, so the index is current before views refresh from the same events
+        self.search_index = SearchIndex()
+        self.attach(self.search_index, SearchIndex.EVENTS)
+        self.text_index = TrigramIndex(lambda: self.tasks)
+        self.attach(self.text_index, TrigramIndex.EVENTS)
+        self.name_index = FuzzyNameIndex()
+        self.attach(self.name_index, FuzzyNameIndex.EVENTS)
+        
+        # With load=False the caller hydrates the model later, e.g. through ModelLoader
+        self.loaded = False
+        self.load_failed = False  # The stored tasks could not be read; the model starts empty
+        if load:
+            self.load_tasks()
+            self.load_tags()
+            self.loaded = True
+    
+    @property
+    def tasks(self):
+        """All tasks in schedule order"""
+        if self._task_list is None:
+            self._task_list = list(self._tasks_by_id.values())
+        return self._task_list
+    
+    @tasks.setter
+    def tasks(self, tasks):
+        self._tasks_by_id = {task.id: task for task in tasks}
+        self._task_list = None
+        self._task_order = {}
+        self._next_order = 0
+        self._day_buckets = {}
+        self._tag_index = {}
+        for task in self._tasks_by_id.values():
+            self._index_task(task)
+    
+    def _index_task(self, task):
+        """Add a task to the lookup indexes"""
+        self._task_order[task.id] = self._next_order
+        self._next_order += 1
+        self._add_to_index(self._day_buckets, task, task.days)
+        self._add_to_index(self._tag_index, task, task.tags)
+    
+    def _unindex_task(self, task):
+        """Remove a task from the lookup indexes"""
+        self._task_order.pop(task.id, None)
+        self._remove_from_index(self._day_buckets, task, task.days)
+        self._remove_from_index(self._tag_index, task, task.tags)
+    
+    @staticmethod
+    def _add_to_index(index, task, keys):
+        for key in keys:
+            index.setdefault(key, {})[task.id] = task
+    
+    @staticmethod
+    def _remove_from_index(index, task, keys):
+        for key in keys:
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(task.id, None)
+                if not bucket:
+                    del index[key]
+    
+    def get_task(self, task_id):
+        """Get a task by its id, or None if it does not exist"""
+        return self._tasks_by_id.get(task_id)
     
     def add_task(self, task):
         """Add a new task to the schedule"""
-        self.tasks.append(task)
-        self.notify()
+        existing = self._tasks_by_id.get(task.id)
+        if existing is not None:
+            self._unindex_task(existing)
+        self._tasks_by_id[task.id] = task
+        self._task_list = None
+        self._index_task(task)
+        self._persist(self.storage.task_added, task)
+        self.notify(ChangeEvent(ChangeEvent.TASK_ADDED, task.id))
     
     def delete_task(self, task):
         """Remove a task from the schedule"""
-        if task in self.tasks:
-            self.tasks.remove(task)
-            self.notify()
+        removed = self._tasks_by_id.pop(task.id, None)
+        if removed is not None:
+            self._task_list = None
+            self._unindex_task(removed)
+            self._persist(self.storage.task_deleted, task)
+            self.notify(ChangeEvent(ChangeEvent.TASK_REMOVED, task.id))
+    
+    def update_task(self, task, attributes):
+        """Update task attributes and record the fields whose values actually changed"""
+        keys = [key for key in attributes if key != "id" and hasattr(task, key)]
+        indexed = task.id in self._tasks_by_id
+        if indexed:
+            self._remove_from_index(self._day_buckets, task, task.days)
+            self._remove_from_index(self._tag_index, task, task.tags)
+        changed = []
+        for key in keys:
+            # Compared after assignment, so e.g. a days list equal to the stored tuple is no change
+            before = getattr(task, key)
+            setattr(task, key, attributes[key])
+            if getattr(task, key) != before:
+                changed.append(key)
+        if indexed:
+            self._add_to_index(self._day_buckets, task, task.days)
+            self._add_to_index(self._tag_index, task, task.tags)
+        if not changed:
+            return True
+        
+        task.mark_modified(changed)
+        if indexed:
+            task_dict = task.to_dict()
+            fields = {key: task_dict[key] for key in changed if key in task_dict}
+            if fields:
+                fields["save_date"] = task.modified_at
+                self._persist(self.storage.task_updated, task, fields)
+        
+        self.notify(ChangeEvent(ChangeEvent.TASK_UPDATED, task.id, changed))
+        return True
     
     def delete_closed_tasks(self):
         """Delete all tasks with 'closed' status"""
+        closed_ids = [task.id for task in self.tasks if task.status == "closed"]
         self.tasks = [task for task in self.tasks if task.status != "closed"]
-        self.notify()
+        self._persist(self.storage.closed_tasks_deleted)
+        self.notify(*[ChangeEvent(ChangeEvent.TASK_REMOVED, task_id) for task_id in closed_ids])
+    
+    def _persist(self, operation, *args):
+        """Pass a single task mutation on to the storage backend"""
+        try:
+            operation(*args)
+        except Exception as e:
+            logging.error(f"Error persisting task change: {e}", exc_info=True)
     
-    def get_today_tasks(self, include_exceptions=False, include_free=True):
+    def get_today_tasks(self, include_exceptions=False, include_free=True, exclude_free=False):
         """
         Get tasks for today
         
         Args:
             include_exceptions: If True, return all tasks regardless of day
             include_free: If True, also include tasks with 'Free' attribute
+            exclude_free: If True, leave out today's tasks that are also marked 'Free'
         """
-        today = datetime.datetime.now().strftime("%A")
-        
-        # Get today's tasks from the loaded tasks
         if include_exceptions:
             return self.tasks
-        else:
-            if include_free:
-                filtered_tasks = [task for task in self.tasks if today in task.days or "Free" in task.days]
-            else:
-                filtered_tasks = [task for task in self.tasks if today in task.days]
+        
+        # Answered from the day buckets, so the cost depends on the result size only
+        tasks = dict(self._day_buckets.get(current_day_name(), {}))
+        if include_free:
+            tasks.update(self._day_buckets.get("Free", {}))
+        elif exclude_free:
+            for task_id in self._day_buckets.get("Free", {}):
+                tasks.pop(task_id, None)
+        
+        return sorted(tasks.values(), key=lambda task: self._task_order[task.id])
+    
+    def get_tasks_for_day(self, day):
+        """Get tasks scheduled on the given day name (or 'Free') in schedule order"""
+        tasks = self._day_buckets.get(day, {}).values()
+        return sorted(tasks, key=lambda task: self._task_order[task.id])
+    
+    def get_tasks_with_tag(self, tag):
+        """Get tasks carrying the given tag in schedule order"""
+        tasks = self._tag_index.get(tag, {}).values()
+        return sorted(tasks, key=lambda task: self._task_order[task.id])
+    
+    def get_tasks_changed_since(self, since):
+        """Get tasks modified at or after a datetime or timestamp string, in schedule order"""
+        if not isinstance(since, str):
+            since = format_timestamp(since)
+        return [task for task in self.tasks if task.modified_at >= since]
+    
+    def get_dirty_tasks(self):
+        """Get tasks with changes not yet marked clean, in schedule order"""
+        return [task for task in self.tasks if task.is_dirty]
+    
+    def search_task_ids(self, query):
+        """Get ids of tasks whose name, status, days or tags contain the query,
+        or whose text, details included, contains every word of it
+        
+        Queries shorter than MIN_TEXT_QUERY_LENGTH only match the start of the details.
+        """
+        if len(query.strip()) < self.MIN_TEXT_QUERY_LENGTH:
+            # Too short for trigrams, and scanning whole details costs too much per keystroke
+            return self.search_index.search(query, include_details=True)
+        task_ids = self.search_index.search(query)
+        matched = set(task_ids)
+        task_ids.extend(task.id for task in self.text_index.search(query) if task.id not in matched)
+        return task_ids
+    
+    def search(self, query, limit=None):
+        """Full-text search over names, tags and details, best matches first
+        
+        Finds nothing while the text index is still being built; see text_search_ready.
+        """
+        return self.text_index.search(query, limit)
+    
+    def text_search_ready(self):
+        """Whether the full-text index has been built and search() returns matches"""
+        return self.text_index.ready
     
-        return filtered_tasks
+    def find_pickable_tasks(self, query, include_other_days=False, exclude_ids=(), limit=50):
+        """
+        Fuzzy-match tasks that can be added to today's list, best matches first
+        
+        Args:
+            include_other_days: If True, tasks of other days are eligible too;
+                Free and today's tasks always are
+            exclude_ids: Ids of tasks that are already on today's list
+            limit: Maximum number of tasks to return
+        """
+        exclude_ids = set(exclude_ids)
+        if include_other_days:
+            accept = lambda task_id: task_id not in exclude_ids
+        else:
+            today = self._day_buckets.get(current_day_name(), {})
+            free = self._day_buckets.get("Free", {})
+            accept = lambda task_id: task_id not in exclude_ids and (task_id in today or task_id in free)
+        
+        if not query.strip():
+            # No query: eligible tasks in schedule order, stopping once the page is full
+            tasks = self.tasks if include_other_days else self.get_today_tasks(include_free=True)
+            return list(islice((task for task in tasks if task.id not in exclude_ids), limit))
+        return [self._tasks_by_id[task_id] for task_id in self.name_index.rank(query, accept, limit)]
     
     def add_tag(self, tag):
         """Add a new tag"""
         if tag not in self.tags:
             self.tags.append(tag)
             self.save_tags()
-            self.notify()
+            self.notify(ChangeEvent(ChangeEvent.TAGS_CHANGED))
     
-    def delete_tag(self, tag):
-        """Remove a tag"""
+    def delete_tag(self, tag, cascade=False):
+        """
+        Remove a tag
+        
+        Args:
+            cascade: If True, also remove the tag from every task that carries it
+        """
+        affected = list(self._tag_index.get(tag, {}).values()) if cascade else []
+        if tag not in self.tags and not affected:
+            return
+        
         if tag in self.tags:
             self.tags.remove(tag)
-            self.save_tags()
-            self.notify()
+        events = [self._replace_task_tags(task, [t for t in task.tags if t != tag]) for task in affected]
+        self.save_tags()
+        self.notify(ChangeEvent(ChangeEvent.TAGS_CHANGED), *events)
+    
+    def rename_tag(self, old_tag, new_tag):
+        """Rename a tag on the tag list and on every task that carries it"""
+        if old_tag == new_tag:
+            return
+        if new_tag in self.tags:
+            self.merge_tags([old_tag], new_tag)
+            return
+        
+        if old_tag in self.tags:
+            self.tags[self.tags.index(old_tag)] = new_tag
+        else:
+            self.tags.append(new_tag)
+        events = [self._replace_task_tags(task, [new_tag if t == old_tag else t for t in task.tags])
+                  for task in list(self._tag_index.get(old_tag, {}).values())]
+        self.save_tags()
+        self.notify(ChangeEvent(ChangeEvent.TAGS_CHANGED), *events)
+    
+    def merge_tags(self, source_tags, target_tag):
+        """Merge several tags into one, retagging only the affected tasks"""
+        sources = [tag for tag in source_tags if tag != target_tag]
+        if not sources:
+            return
+        
+        affected = {}
+        for tag in sources:
+            affected.update(self._tag_index.get(tag, {}))
+        
+        events = []
+        for task in affected.values():
+            tags = []
+            for tag in task.tags:
+                tag = target_tag if tag in sources else tag
+                if tag not in tags:
+                    tags.append(tag)
+            events.append(self._replace_task_tags(task, tags))
+        
+        self.tags = [tag for tag in self.tags if tag not in sources]
+        if target_tag not in self.tags:
+            self.tags.append(target_tag)
+        self.save_tags()
+        self.notify(ChangeEvent(ChangeEvent.TAGS_CHANGED), *events)
+    
+    def _replace_task_tags(self, task, tags):
+        """Set a task's tags, keeping the tag index and storage in step, and return the change event"""
+        self._remove_from_index(self._tag_index, task, task.tags)
+        task.tags = tags
+        task.mark_modified(("tags",))
+        self._add_to_index(self._tag_index, task, task.tags)
+        self._persist(self.storage.task_updated, task, {"tags": list(task.tags), "save_date": task.modified_at})
+        return ChangeEvent(ChangeEvent.TASK_UPDATED, task.id, ("tags",))
     
     def save_tasks(self):
-        """Save tasks to configuration file"""
-        data = [task.to_dict() for task in self.tasks]
-        os.makedirs(os.path.dirname(DATA_FILES["tasks"]), exist_ok=True)
-        with open(DATA_FILES["tasks"], "w") as file:
-            json.dump(data, file, indent=4)
-        logging.info(f"Saved {len(self.tasks)} tasks to {DATA_FILES['tasks']}")
-        return True
+        """Save tasks through the storage backend"""
+        return self.storage.save_tasks(self.tasks)
+    
+    def flush_pending_writes(self):
+        """Finish every scheduled background write, e.g. before the data files are copied"""
+        self.saver.flush()
+    
+    def has_unsaved_writes(self):
+        """Whether background writes are still scheduled or running"""
+        return self.saver.dirty
+    
+    def save_snapshot_cache(self):
+        """Write the task list to the binary snapshot cache read on the next start"""
+        # After a failed load the empty task list must not be cached as the contents of the sources
+        if self.snapshot_cache is not None and self.loaded and not self.load_failed:
+            self.snapshot_cache.save(self.tasks)
+    
+    def close(self):
+        """Flush pending writes, release the storage backend and refresh the snapshot cache"""
+        self.saver.close()
+        self.storage.close()
+        if self.storage.saves_every_change:
+            # The files hold every change, so they match the tasks in memory
+            self.save_snapshot_cache()
     
     def load_tasks(self):
-        """Load tasks from configuration file"""
+        """Load tasks from the storage backend"""
         try:
-            if os.path.exists(DATA_FILES["tasks"]):
-                with open(DATA_FILES["tasks"], "r") as file:
-                    data = json.load(file)
-                    self.tasks = [Task.from_dict(task_dict) for task_dict in data]
-                    logging.info(f"Loaded {len(self.tasks)} tasks from {DATA_FILES['tasks']}")
+            self.tasks = [task for batch in self.read_stored_batches() for task in batch]
+            logging.info(f"Loaded {len(self.tasks)} tasks")
         except Exception as e:
             logging.error(f"Error loading tasks: {e}", exc_info=True)
+            self._loading_failed()
             self.tasks = []
+        self.notify(ChangeEvent(ChangeEvent.TASKS_RELOADED))
+    
+    def fail_loading(self):
+        """Start with an empty schedule after a background load failed, without caching it"""
+        self._loading_failed()
+        self.apply_stored_data([], None)
+    
+    def _loading_failed(self):
+        self.load_failed = True
+        if self.snapshot_cache is not None:
+            try:
+                self.snapshot_cache.invalidate()
+            except OSError as e:
+                logging.error(f"Error removing the task snapshot cache: {e}", exc_info=True)
+    
+    def read_stored_batches(self, batch_size=None):
+        """Yield stored tasks in batches as the storage backend parses them
+        
+        Touches no model state, so it can run on a worker thread; hand each
+        batch to append_stored_tasks on the UI thread.
+        """
+        batch_size = batch_size or self.LOAD_BATCH_SIZE
+        tasks = self.snapshot_cache.load() if self.snapshot_cache is not None else None
+        if tasks is not None:
+            logging.info(f"Read {len(tasks)} tasks from {self.snapshot_cache.path}")
+            self.storage.snapshot_cache_used()
+            for start in range(0, len(tasks), batch_size):
+                yield tasks[start:start + batch_size]
+            return
+        
+        for task_dicts in self.storage.iter_task_batches(batch_size):
+            yield [Task.from_dict(task_dict) for task_dict in task_dicts]
+    
+    def read_stored_tags(self):
+        """Read the stored tag list without changing the model, or None when nothing is stored"""
+        return self.storage.load_tags()
+    
+    def append_stored_tasks(self, tasks):
+        """Add a batch of tasks read from storage, without persisting them again"""
+        with self.batch():
+            for task in tasks:
+                existing = self._tasks_by_id.get(task.id)
+                if existing is not None:
+                    self._unindex_task(existing)
+                self._tasks_by_id[task.id] = task
+                self._index_task(task)
+                self.notify(ChangeEvent(ChangeEvent.TASK_ADDED, task.id))
+            self._task_list = None
+    
+    def finish_loading(self, tags=None):
+        """Mark the model loaded after the last stored batch and notify observers"""
+        with self.batch():
+            logging.info(f"Loaded {len(self._tasks_by_id)} tasks")
+            if tags is not None:
+                self.tags = tags
+                logging.info(f"Loaded {len(self.tags)} tags")
+                self.notify(ChangeEvent(ChangeEvent.TAGS_CHANGED))
+            self.loaded = True
+            self.notify(ChangeEvent(ChangeEvent.CHANGED))
+        # Streamed batches are not indexed one by one; index them all off the UI thread
+        self.text_index.build_in_background()
+    
+    def apply_stored_data(self, tasks, tags=None):
+        """Replace all tasks with ones read from storage, mark the model loaded and notify observers"""
+        with self.batch():
+            self.tasks = tasks
+            logging.info(f"Loaded {len(self.tasks)} tasks")
+            if tags is not None:
+                self.tags = tags
+                logging.info(f"Loaded {len(self.tags)} tags")
+                self.notify(ChangeEvent(ChangeEvent.TAGS_CHANGED))
+            self.loaded = True
+            self.notify(ChangeEvent(ChangeEvent.TASKS_RELOADED))
     
     def save_tags(self):
-        """Save tags to configuration file"""
-        os.makedirs(os.path.dirname(DATA_FILES["tags"]), exist_ok=True)
-        with open(DATA_FILES["tags"], "w") as file:
-            json.dump(self.tags, file, indent=4)
-        logging.info(f"Saved {len(self.tags)} tags to {DATA_FILES['tags']}")
-        return True
+        """Save tags through the storage backend"""
+        return self.storage.save_tags(self.tags)
     
     def load_tags(self):
-        """Load tags from configuration file"""
+        """Load tags from the storage backend"""
         try:
-            if os.path.exists(DATA_FILES["tags"]):
-                with open(DATA_FILES["tags"], "r") as file:
-                    self.tags = json.load(file)
-                    logging.info(f"Loaded {len(self.tags)} tags from {DATA_FILES['tags']}")
+            tags = self.storage.load_tags()
+            if tags is not None:
+                self.tags = tags
+                logging.info(f"Loaded {len(self.tags)} tags")
         except Exception as e:
             logging.error(f"Error loading tags: {e}", exc_info=True)
             # Use default tags
@@ -116,7 +463,7 @@ class ScheduleModel(Subject):
             "tasks": [
                 {
                     "name": task.name,
-                    "tags": task.tags,
+                    "tags": list(task.tags),
                     "work_time": task.calculated_work_time,
                     "perceived_effort": task.perceived_effort
                 }
@@ -124,29 +471,16 @@ class ScheduleModel(Subject):
             ]
         }
         
-        # Load existing data if file exists
-        all_data = []
-        if os.path.exists(DATA_FILES["work_time"]):
-            try:
-                with open(DATA_FILES["work_time"], "r") as file:
-                    all_data = json.load(file)
-            except Exception as e:
-                logging.error(f"Error reading work time data: {e}", exc_info=True)
-                all_data = []
-        
-        # Append new data
-        if not isinstance(all_data, list):
-            all_data = []
-        all_data.append(data)
-        
-        # Save back to file
-        os.makedirs(os.path.dirname(DATA_FILES["work_time"]), exist_ok=True)
-        with open(DATA_FILES["work_time"], "w") as file:
-            json.dump(all_data, file, indent=4)
+        self.storage.append_work_time(data)
         
         logging.info(f"Saved work time data for {len(calculated_tasks)} tasks")
+        self.notify(ChangeEvent(ChangeEvent.WORK_TIME_SAVED))
         return True
     
+    def get_work_time_history(self, start=None, end=None, task_name=None):
+        """Get saved work time entries, optionally limited to a date range or task"""
+        return self.storage.get_work_time_history(start, end, task_name)
+    
     def save_today_tasks(self, tasks):
         """Save today's tasks to todaytask.conf with date information"""
         if not tasks:
@@ -159,18 +493,13 @@ class ScheduleModel(Subject):
             "tasks": [task.to_dict() for task in tasks]
         }
         
-        try:
-            # Make sure the directory exists
-            os.makedirs(os.path.dirname(DATA_FILES["today_tasks"]), exist_ok=True)
-            
-            # Save directly to file - don't append, replace with new data
-            with open(DATA_FILES["today_tasks"], "w") as file:
-                json.dump(data, file, indent=4)
-        
-            logging.info(f"Saved {len(tasks)} today's tasks to {DATA_FILES['today_tasks']}")
-            return True
-        except Exception as e:
-            logging.error(f"Error saving today's tasks: {str(e)}", exc_info=True)
-            return False
-            logging.error(f"Error saving today's tasks: {str(e)}")
-            return False
+        path = DATA_FILES["today_tasks"]
+        
+        def write():
+            # Replaced as a whole, never appended to
+            atomic_write_json(path, data)
+            logging.info(f"Saved {len(tasks)} today's tasks to {path}")
+        
+        self.saver.mark_dirty("today_tasks", write)
+        self.notify(ChangeEvent(ChangeEvent.TODAY_TASKS_SAVED))
+        return True
@@ -0,0 +1,87 @@
+"""
+Lower-cased text index used to search tasks without touching the views
+"""
+from patterns.observer import Observer, ChangeEvent
+
+class SearchIndex(Observer):
+    """Searchable text of every task, kept in step with the model through change events
+
+    Only the short fields are kept whole; details are matched through the
+    trigram index, and here only by their first DETAILS_PREFIX_LENGTH
+    characters, for queries too short for trigrams.
+    """
+
+    FIELDS = frozenset(("name", "status", "days", "tags", "details"))
+    DETAILS_PREFIX_LENGTH = 80
+    EVENTS = (ChangeEvent.TASK_ADDED, ChangeEvent.TASK_REMOVED,
+              ChangeEvent.TASK_UPDATED, ChangeEvent.TASKS_RELOADED)
+
+    def __init__(self):
+        self._texts = {}  # Task id -> lower-cased searchable text, in schedule order
+        self._details = {}  # Task id -> lower-cased start of the details, for tasks that have any
+        self._version = 0
+        self._last_search = None  # (version, query, include_details, matching ids) of the previous search
+
+    def update(self, subject, events):
+        """Apply model change events to the index"""
+        for event in events:
+            if event.kind == ChangeEvent.TASKS_RELOADED:
+                self.rebuild(subject.tasks)
+            elif event.kind == ChangeEvent.TASK_REMOVED:
+                self.remove(event.task_id)
+            elif event.kind == ChangeEvent.TASK_ADDED or (
+                    event.kind == ChangeEvent.TASK_UPDATED and event.fields & self.FIELDS):
+                task = subject.get_task(event.task_id)
+                if task is not None:
+                    self.add(task)
+            # Generic CHANGED notifications carry no task changes
+
+    def rebuild(self, tasks):
+        """Index the given tasks, replacing everything indexed before"""
+        self._texts = {}
+        self._details = {}
+        for task in tasks:
+            self._index(task)
+        self._version += 1
+
+    def add(self, task):
+        """Index a task, or re-index it after a change"""
+        self._index(task)
+        self._version += 1
+
+    def remove(self, task_id):
+        """Drop a task from the index"""
+        self._details.pop(task_id, None)
+        if self._texts.pop(task_id, None) is not None:
+            self._version += 1
+
+    def search(self, query, include_details=False):
+        """Get the ids of tasks whose fields contain the query, in schedule order
+
+        With include_details, the start of the details is searched as well.
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(self._texts)
+
+        # A query that extends the previous one can only match a subset of its results
+        candidates = self._texts
+        last = self._last_search
+        if last and last[0] == self._version and last[1] in query and last[2] == include_details:
+            candidates = last[3]
+
+        texts = self._texts
+        details = self._details if include_details else {}
+        matches = [task_id for task_id in candidates
+                   if query in texts[task_id] or query in details.get(task_id, "")]
+        self._last_search = (self._version, query, include_details, matches)
+        return matches
+
+    def _index(self, task):
+        # Fields are kept on separate lines so a query never matches across two of them
+        self._texts[task.id] = "\n".join((task.name, task.status, ", ".join(task.days),
+                                          ", ".join(task.tags))).lower()
+        if task.details:
+            self._details[task.id] = task.details[:self.DETAILS_PREFIX_LENGTH].lower()
+        else:
+            self._details.pop(task.id, None)
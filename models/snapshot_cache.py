@@ -0,0 +1,234 @@
+"""
+Versioned binary cache of the stored task list, validated against its source files
+
+Layout (little-endian):
+    header       magic, format version, source count
+    sources      per source file: exists, size, mtime (ns), BLAKE2b digest of the contents
+    strings      count, character lengths, one UTF-8 blob holding every distinct string
+    tag sets     count, then per set its length followed by string indices
+    tasks        count, then fixed-size records (see _RECORD)
+"""
+import os
+import gc
+import sys
+import json
+import struct
+import hashlib
+import logging
+from array import array
+
+from .task_model import Task
+
+MAGIC = b"TSKC"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<4sHH")
+_SOURCE = struct.Struct("<?Qq16s")
+_COUNT = struct.Struct("<I")
+# id, name, details, status, tag set, recurring, modified (string indices), day mask, completed, priority, effort
+_RECORD = struct.Struct("<7IHBbi")
+
+NO_VALUE = 0xFFFFFFFF
+DIGEST_SIZE = 16
+HASH_CHUNK_SIZE = 1 << 20
+_MISSING_SOURCE = (False, 0, 0, bytes(DIGEST_SIZE))
+
+class TaskSnapshotCache:
+    """Binary copy of the task list, loaded instead of the JSON sources while they are unchanged"""
+
+    def __init__(self, path, source_paths):
+        self.path = path
+        self.source_paths = list(source_paths)
+        self._digests = {}  # (path, size, mtime_ns) -> digest of contents already hashed
+
+    def load(self):
+        """Return the cached tasks, or None when the cache is missing, stale or unreadable"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as file:
+                magic, version, source_count = _HEADER.unpack(file.read(_HEADER.size))
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    logging.info(f"Ignoring task cache {self.path} with format version {version}")
+                    return None
+                stamps = [_SOURCE.unpack(file.read(_SOURCE.size)) for _ in range(source_count)]
+                if len(stamps) != len(self.source_paths) or not all(
+                        self._matches(path, stamp) for path, stamp in zip(self.source_paths, stamps)):
+                    return None
+                body = memoryview(file.read())
+            # Only new objects are created; skip the collector passes their numbers would trigger
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return self._decode(body)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+        except (OSError, ValueError, IndexError, struct.error) as e:
+            logging.warning(f"Ignoring unreadable task cache {self.path}: {e}")
+            return None
+
+    def save(self, tasks):
+        """Write the tasks to the cache, stamped with the current state of the source files"""
+        try:
+            stamps = [self._stamp(path) for path in self.source_paths]
+            body = self._encode(tasks)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(stamps)))
+                for stamp in stamps:
+                    file.write(_SOURCE.pack(*stamp))
+                file.write(body)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+            logging.info(f"Wrote {len(tasks)} tasks to the task cache {self.path}")
+            return True
+        except (OSError, ValueError, struct.error) as e:
+            logging.warning(f"Could not write task cache {self.path}: {e}")
+            self.invalidate()
+            return False
+
+    def invalidate(self):
+        """Remove the cache file so the sources are read on the next start"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _matches(self, path, stamp):
+        """Check a source file against the stamp recorded when the cache was written"""
+        exists, size, mtime_ns, digest = stamp
+        if not os.path.exists(path):
+            return not exists
+        stat = os.stat(path)
+        if not exists or stat.st_size != size:
+            return False
+        # A touched or copied file may still hold the same contents
+        if stat.st_mtime_ns != mtime_ns and self._digest(path) != digest:
+            return False
+        self._digests[(path, stat.st_size, stat.st_mtime_ns)] = digest
+        return True
+
+    def _stamp(self, path):
+        """Describe the current state of a source file"""
+        if not os.path.exists(path):
+            return _MISSING_SOURCE
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = self._digest(path)
+        return (True, stat.st_size, stat.st_mtime_ns, digest)
+
+    @staticmethod
+    def _digest(path):
+        hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.digest()
+
+    @staticmethod
+    def _encode(tasks):
+        """Serialize tasks to the cache body; raises ValueError for values the format cannot hold"""
+        strings = {}
+        tag_sets = {}
+
+        def string_index(value):
+            if not isinstance(value, str):
+                raise ValueError(f"Cannot cache non-string value {value!r}")
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+            return index
+
+        records = bytearray()
+        for task in tasks:
+            tags = task.tags
+            tag_set = tag_sets.get(tags)
+            if tag_set is None:
+                tag_set = tag_sets[tags] = len(tag_sets)
+                for tag in tags:
+                    string_index(tag)
+            recurring = task.recurring
+            effort = task.perceived_effort
+            if not isinstance(task.completed_today, bool) or not isinstance(effort, int) or isinstance(effort, bool):
+                raise ValueError(f"Cannot cache task {task.id} with non-standard field types")
+            records += _RECORD.pack(
+                string_index(task.id), string_index(task.name), string_index(task.details),
+                string_index(task.status), tag_set,
+                string_index(json.dumps(dict(recurring))) if recurring else NO_VALUE,
+                string_index(task.modified_at), task.day_mask, task.completed_today, task.priority, effort
+            )
+
+        texts = list(strings)
+        tag_table = array("I")
+        for tags in tag_sets:
+            tag_table.append(len(tags))
+            tag_table.extend(strings[tag] for tag in tags)
+
+        parts = [
+            _COUNT.pack(len(texts)), array("I", map(len, texts)).tobytes(), "".join(texts).encode("utf-8"),
+            _COUNT.pack(len(tag_sets)), _COUNT.pack(len(tag_table)), tag_table.tobytes(),
+            _COUNT.pack(len(tasks)), bytes(records)
+        ]
+        # The UTF-8 blob's byte length is needed to find the sections after it
+        parts.insert(2, _COUNT.pack(len(parts[2])))
+        return b"".join(parts)
+
+    @staticmethod
+    def _decode(body):
+        """Rebuild tasks from the cache body"""
+        offset = 0
+
+        def read_count():
+            nonlocal offset
+            value = _COUNT.unpack_from(body, offset)[0]
+            offset += _COUNT.size
+            return value
+
+        def read_array(count):
+            nonlocal offset
+            values = array("I")
+            values.frombytes(body[offset:offset + count * values.itemsize])
+            offset += count * values.itemsize
+            return values
+
+        string_count = read_count()
+        lengths = read_array(string_count)
+        blob_size = read_count()
+        blob = str(body[offset:offset + blob_size], "utf-8")
+        offset += blob_size
+        strings = []
+        position = 0
+        for length in lengths:
+            strings.append(blob[position:position + length])
+            position += length
+
+        tag_set_count = read_count()
+        tag_table = read_array(read_count())
+        tag_sets = []
+        position = 0
+        for _ in range(tag_set_count):
+            length = tag_table[position]
+            tag_sets.append(tuple(sys.intern(strings[index])
+                                  for index in tag_table[position + 1:position + 1 + length]))
+            position += 1 + length
+
+        task_count = read_count()
+        records = body[offset:offset + task_count * _RECORD.size]
+        if len(records) != task_count * _RECORD.size:
+            raise ValueError("Truncated task records")
+
+        statuses = {}
+        restore = Task.restore
+        tasks = []
+        for (id_index, name_index, details_index, status_index, tag_set, recurring_index, modified_index,
+             day_mask, completed, priority, effort) in _RECORD.iter_unpack(records):
+            status = statuses.get(status_index)
+            if status is None:
+                status = statuses[status_index] = sys.intern(strings[status_index])
+            recurring = json.loads(strings[recurring_index]) if recurring_index != NO_VALUE else None
+            tasks.append(restore(strings[id_index], strings[name_index], status, day_mask,
+                                 strings[details_index], tag_sets[tag_set], bool(completed),
+                                 effort, priority, recurring, strings[modified_index]))
+        return tasks
@@ -0,0 +1,350 @@
+"""
+SQLite storage backend for tasks, tags and work-time history
+"""
+import os
+import json
+import uuid
+import sqlite3
+import datetime
+import logging
+import threading
+
+from .storage import ScheduleStorage, JsonFileStorage
+from utils.config import DATA_FILES
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        uid TEXT NOT NULL,
+        name TEXT NOT NULL DEFAULT '',
+        status TEXT NOT NULL DEFAULT 'planned',
+        details TEXT NOT NULL DEFAULT '',
+        completed_today INTEGER NOT NULL DEFAULT 0,
+        perceived_effort INTEGER NOT NULL DEFAULT 0,
+        priority INTEGER NOT NULL DEFAULT 1,
+        recurring TEXT NOT NULL DEFAULT '{}',
+        save_date TEXT
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_uid ON tasks(uid);
+    CREATE INDEX IF NOT EXISTS idx_tasks_save_date ON tasks(save_date);
+
+    CREATE TABLE IF NOT EXISTS task_days (
+        task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+        day TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (task_id, day)
+    );
+
+    CREATE TABLE IF NOT EXISTS tags (
+        name TEXT PRIMARY KEY,
+        position INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS task_tags (
+        task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+        tag TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (task_id, tag)
+    );
+
+    CREATE TABLE IF NOT EXISTS work_time_entries (
+        id INTEGER PRIMARY KEY,
+        saved_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_work_time_saved_at ON work_time_entries(saved_at);
+
+    CREATE TABLE IF NOT EXISTS work_time_tasks (
+        entry_id INTEGER NOT NULL REFERENCES work_time_entries(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        task_name TEXT NOT NULL,
+        tags TEXT NOT NULL DEFAULT '[]',
+        work_time REAL NOT NULL DEFAULT 0,
+        perceived_effort INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_work_time_tasks_entry ON work_time_tasks(entry_id);
+    CREATE INDEX IF NOT EXISTS idx_work_time_tasks_name ON work_time_tasks(task_name);
+"""
+
+# Scalar task fields stored directly in the tasks table
+TASK_COLUMNS = ["name", "status", "details", "completed_today", "perceived_effort", "priority", "recurring"]
+
+class SqliteStorage(ScheduleStorage):
+    """Storage backed by an indexed SQLite database"""
+
+    def __init__(self, db_path, data_files=None):
+        self.db_path = db_path
+        is_new = not os.path.exists(db_path)
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Writes run on the saver thread and the schedule is first read on a worker
+        # thread (see ModelLoader), so every use of the connection holds the lock
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        if is_new:
+            self.migrate_from_conf(data_files or DATA_FILES)
+
+    def close(self):
+        self._flush_writes()
+        with self._lock:
+            self.connection.close()
+
+    # Tasks
+
+    def load_tasks(self):
+        return self._fetch_tasks()
+
+    def save_tasks(self, tasks):
+        # Every change is written row by row as it happens
+        self._flush_writes()
+        logging.info(f"Tasks are stored in {self.db_path}")
+        return True
+
+    def task_added(self, task):
+        task_id = task.id
+        task_dict = task.to_dict()
+
+        def write():
+            self.connection.execute("DELETE FROM tasks WHERE uid = ?", (task_id,))
+            self._insert_task(task_dict)
+
+        self._write_transaction(write)
+
+    def task_updated(self, task, fields):
+        task_id = task.id
+        fields = dict(fields)
+        columns = {key: value for key, value in fields.items() if key in TASK_COLUMNS}
+        if "recurring" in columns:
+            columns["recurring"] = json.dumps(columns["recurring"])
+        columns["save_date"] = fields.get("save_date") or self._now()
+
+        def write():
+            row = self.connection.execute("SELECT id FROM tasks WHERE uid = ?", (task_id,)).fetchone()
+            if row is None:
+                return
+            row_id = row["id"]
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            self.connection.execute(f"UPDATE tasks SET {assignments} WHERE id = ?",
+                                    [*columns.values(), row_id])
+            if "days" in fields:
+                self.connection.execute("DELETE FROM task_days WHERE task_id = ?", (row_id,))
+                self._insert_links("task_days", "day", row_id, fields["days"])
+            if "tags" in fields:
+                self.connection.execute("DELETE FROM task_tags WHERE task_id = ?", (row_id,))
+                self._insert_links("task_tags", "tag", row_id, fields["tags"])
+
+        self._write_transaction(write)
+
+    def task_deleted(self, task):
+        task_id = task.id
+        self._write_transaction(lambda: self.connection.execute("DELETE FROM tasks WHERE uid = ?", (task_id,)))
+
+    def closed_tasks_deleted(self):
+        self._write_transaction(lambda: self.connection.execute("DELETE FROM tasks WHERE status = 'closed'"))
+
+    def _write_transaction(self, write, key=None):
+        """Run write() in one transaction on the saver thread; task changes (key None) run in order"""
+        def run():
+            with self._lock, self.connection:
+                write()
+
+        self._write_behind(key, run)
+
+    def load_tasks_changed_since(self, since):
+        return self._fetch_tasks("t.save_date >= ?", [since])
+
+    def _fetch_tasks(self, where="", params=()):
+        """Load task rows together with their days and tags"""
+        clause = f"WHERE {where}" if where else ""
+        self._flush_writes()
+        with self._lock:
+            rows = self.connection.execute(f"SELECT * FROM tasks t {clause} ORDER BY t.id", params).fetchall()
+            if not rows:
+                return []
+
+            days = self._fetch_links("task_days", "day", clause, params)
+            tags = self._fetch_links("task_tags", "tag", clause, params)
+
+        return [
+            {
+                "id": row["uid"],
+                "name": row["name"],
+                "status": row["status"],
+                "days": days.get(row["id"], []),
+                "details": row["details"],
+                "tags": tags.get(row["id"], []),
+                "completed_today": bool(row["completed_today"]),
+                "perceived_effort": row["perceived_effort"],
+                "priority": row["priority"],
+                "recurring": json.loads(row["recurring"] or "{}"),
+                "save_date": row["save_date"]
+            }
+            for row in rows
+        ]
+
+    def _fetch_links(self, table, column, clause, params):
+        """Group link rows by task id for the tasks selected by clause"""
+        query = (f"SELECT l.task_id, l.{column} FROM {table} l "
+                 f"WHERE l.task_id IN (SELECT t.id FROM tasks t {clause}) "
+                 f"ORDER BY l.task_id, l.position")
+        links = {}
+        for task_id, value in self.connection.execute(query, params):
+            links.setdefault(task_id, []).append(value)
+        return links
+
+    def _insert_task(self, task_dict):
+        """Insert a task row with its days and tags, returning the row id"""
+        cursor = self.connection.execute(
+            "INSERT INTO tasks (uid, name, status, details, completed_today, perceived_effort, priority, "
+            "recurring, save_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                task_dict.get("id") or uuid.uuid4().hex,
+                task_dict.get("name", ""),
+                task_dict.get("status", "planned"),
+                task_dict.get("details", ""),
+                int(bool(task_dict.get("completed_today", False))),
+                task_dict.get("perceived_effort", 0),
+                task_dict.get("priority", 1),
+                json.dumps(task_dict.get("recurring") or {}),
+                task_dict.get("save_date") or self._now()
+            )
+        )
+        row_id = cursor.lastrowid
+        self._insert_links("task_days", "day", row_id, task_dict.get("days", []))
+        self._insert_links("task_tags", "tag", row_id, task_dict.get("tags", []))
+        return row_id
+
+    def _insert_links(self, table, column, row_id, values):
+        """Insert day or tag links for a task, ignoring duplicates"""
+        self.connection.executemany(
+            f"INSERT OR IGNORE INTO {table} (task_id, {column}, position) VALUES (?, ?, ?)",
+            [(row_id, value, position) for position, value in enumerate(values)]
+        )
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Tags
+
+    def load_tags(self):
+        self._flush_writes()
+        with self._lock:
+            rows = self.connection.execute("SELECT name FROM tags ORDER BY position").fetchall()
+        return [row["name"] for row in rows] if rows else None
+
+    def save_tags(self, tags):
+        tags = list(tags)
+
+        def write():
+            self.connection.execute("DELETE FROM tags")
+            self.connection.executemany("INSERT OR IGNORE INTO tags (name, position) VALUES (?, ?)",
+                                        [(tag, position) for position, tag in enumerate(tags)])
+            logging.info(f"Saved {len(tags)} tags to {self.db_path}")
+
+        self._write_transaction(write, "tags")
+        return True
+
+    # Work time
+
+    def append_work_time(self, entry):
+        self._write_transaction(lambda: self._insert_work_time(entry))
+        return True
+
+    def load_work_time(self):
+        return self.get_work_time_history()
+
+    def get_work_time_history(self, start=None, end=None, task_name=None):
+        conditions = []
+        params = []
+        if start:
+            conditions.append("e.saved_at >= ?")
+            params.append(start)
+        if end:
+            conditions.append("e.saved_at <= ?")
+            params.append(end)
+        if task_name is not None:
+            conditions.append("w.task_name = ?")
+            params.append(task_name)
+        clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = (f"SELECT e.id, e.saved_at, w.task_name, w.tags, w.work_time, w.perceived_effort "
+                 f"FROM work_time_entries e JOIN work_time_tasks w ON w.entry_id = e.id "
+                 f"{clause} ORDER BY e.id, w.position")
+
+        self._flush_writes()
+        with self._lock:
+            rows = self.connection.execute(query, params).fetchall()
+
+        history = []
+        entries = {}
+        for row in rows:
+            entry = entries.get(row["id"])
+            if entry is None:
+                entry = entries[row["id"]] = {"date": row["saved_at"], "tasks": []}
+                history.append(entry)
+            entry["tasks"].append({
+                "name": row["task_name"],
+                "tags": json.loads(row["tags"]),
+                "work_time": row["work_time"],
+                "perceived_effort": row["perceived_effort"]
+            })
+        return history
+
+    def _insert_work_time(self, entry):
+        """Insert one work-time entry with its task rows"""
+        cursor = self.connection.execute("INSERT INTO work_time_entries (saved_at) VALUES (?)",
+                                         (entry.get("date", self._now()),))
+        self.connection.executemany(
+            "INSERT INTO work_time_tasks (entry_id, position, task_name, tags, work_time, perceived_effort) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (cursor.lastrowid, position, task.get("name", ""), json.dumps(task.get("tags", [])),
+                 task.get("work_time", 0), task.get("perceived_effort", 0))
+                for position, task in enumerate(entry.get("tasks", []))
+            ]
+        )
+
+    # Migration
+
+    def migrate_from_conf(self, data_files):
+        """Import tasks, tags and work-time history from the JSON .conf files"""
+        data_files = dict(data_files)
+        # Older data file maps have no journal entry; it sits next to the task list, as in DATA_FILES
+        data_files.setdefault("tasks_journal", os.path.splitext(data_files["tasks"])[0] + ".journal")
+        source = JsonFileStorage(data_files)
+        try:
+            tasks = source.load_tasks()
+            tags = source.load_tags()
+            work_time = source.load_work_time()
+        except Exception as e:
+            logging.error(f"Error reading .conf files for migration: {e}", exc_info=True)
+            return False
+
+        with self.connection:
+            for task_dict in tasks:
+                self._insert_task(task_dict)
+            if tags is not None:
+                self.connection.executemany("INSERT OR IGNORE INTO tags (name, position) VALUES (?, ?)",
+                                            [(tag, position) for position, tag in enumerate(tags)])
+            for entry in work_time:
+                self._insert_work_time(entry)
+
+        logging.info(f"Migrated {len(tasks)} tasks and {len(work_time)} work time entries to {self.db_path}")
+        return True
+
+def migrate_conf_to_sqlite(db_path=None, data_files=None):
+    """One-shot migration of the .conf files into a new SQLite database"""
+    db_path = db_path or DATA_FILES["database"]
+    if os.path.exists(db_path):
+        logging.warning(f"Database already exists, skipping migration: {db_path}")
+        return False
+    storage = SqliteStorage(db_path, data_files)
+    storage.close()
+    return True
@@ -0,0 +1,311 @@
+"""
+Pluggable persistence backends for the schedule model
+"""
+import os
+import json
+import logging
+from abc import ABC, abstractmethod
+
+from .task_journal import TaskJournal
+from .snapshot_cache import TaskSnapshotCache
+from .write_behind import atomic_write, atomic_write_json
+from .task_model import Task
+from utils.config import (DATA_FILES, STORAGE_BACKEND, TASK_STORAGE_MODE,
+                          JOURNAL_COMPACT_THRESHOLD, SNAPSHOT_CACHE_ENABLED)
+
+class ScheduleStorage(ABC):
+    """Storage interface for tasks, tags and work-time history"""
+
+    # Whether every task change is persisted as it happens, rather than by save_tasks()
+    saves_every_change = True
+
+    # WriteBehindSaver for file writes, attached by ScheduleModel; None writes synchronously
+    saver = None
+
+    # TaskSnapshotCache over the backend's task files, or None when they are not cached
+    snapshot_cache = None
+
+    @abstractmethod
+    def load_tasks(self):
+        """Return all tasks as a list of dictionaries in schedule order"""
+        pass
+
+    def iter_task_batches(self, batch_size=1000):
+        """Yield the tasks of load_tasks() as lists of dictionaries, in schedule order"""
+        tasks = self.load_tasks()
+        for start in range(0, len(tasks), batch_size):
+            yield tasks[start:start + batch_size]
+
+    def snapshot_cache_used(self):
+        """Called after the tasks were read from snapshot_cache instead of load_tasks()"""
+        pass
+
+    def load_tasks_changed_since(self, since):
+        """Return the dictionaries of tasks modified at or after a timestamp string (see Task.modified_at)"""
+        return [task_dict for task_dict in self.load_tasks() if (task_dict.get("save_date") or "") >= since]
+
+    @abstractmethod
+    def save_tasks(self, tasks):
+        """Persist the complete task list"""
+        pass
+
+    @abstractmethod
+    def task_added(self, task):
+        """Persist a task appended to the schedule"""
+        pass
+
+    @abstractmethod
+    def task_updated(self, task, fields):
+        """Persist changed fields of a task"""
+        pass
+
+    @abstractmethod
+    def task_deleted(self, task):
+        """Persist removal of a task"""
+        pass
+
+    @abstractmethod
+    def closed_tasks_deleted(self):
+        """Persist removal of every closed task"""
+        pass
+
+    @abstractmethod
+    def load_tags(self):
+        """Return the stored tag list, or None when nothing is stored"""
+        pass
+
+    @abstractmethod
+    def save_tags(self, tags):
+        """Persist the tag list"""
+        pass
+
+    @abstractmethod
+    def append_work_time(self, entry):
+        """Persist one work-time entry ({"date": ..., "tasks": [...]})"""
+        pass
+
+    @abstractmethod
+    def load_work_time(self):
+        """Return the complete work-time history"""
+        pass
+
+    def get_work_time_history(self, start=None, end=None, task_name=None):
+        """Return work-time entries between two date strings, optionally for one task"""
+        history = []
+        for entry in self.load_work_time():
+            date = entry.get("date", "")
+            if (start and date < start) or (end and date > end):
+                continue
+            if task_name is not None:
+                tasks = [task for task in entry.get("tasks", []) if task.get("name") == task_name]
+                if not tasks:
+                    continue
+                entry = dict(entry, tasks=tasks)
+            history.append(entry)
+        return history
+
+    def close(self):
+        """Release resources held by the backend"""
+        pass
+
+    def _write_behind(self, key, write):
+        """Hand a write to the saver when one is attached, otherwise run it now"""
+        if self.saver is not None:
+            self.saver.mark_dirty(key, write)
+        else:
+            write()
+
+    def _flush_writes(self):
+        """Finish pending writes before reading files they may change"""
+        if self.saver is not None:
+            self.saver.flush()
+
+class JsonFileStorage(ScheduleStorage):
+    """Storage backed by the JSON .conf files, with an optional task journal"""
+
+    def __init__(self, data_files=None, journaled=True):
+        self.data_files = data_files or DATA_FILES
+        self.journaled = journaled
+        self._fragments = {}  # Task id -> JSON text last written for the task, in snapshot mode
+        self.journal = TaskJournal(self.data_files["tasks_journal"], self.data_files["tasks"],
+                                   JOURNAL_COMPACT_THRESHOLD)
+        cache_path = self.data_files.get("tasks_cache")
+        if SNAPSHOT_CACHE_ENABLED and cache_path:
+            # The task list is the snapshot with the journals replayed on top
+            self.snapshot_cache = TaskSnapshotCache(cache_path, [self.data_files["tasks"], self.journal.journal_path,
+                                                                 self.journal.compacting_path])
+
+    def load_tasks(self):
+        self._flush_writes()
+        return self.journal.load()
+
+    def iter_task_batches(self, batch_size=1000):
+        self._flush_writes()
+        # Parses the snapshot incrementally instead of building every dictionary first
+        return self.journal.load_batches(batch_size)
+
+    @property
+    def saves_every_change(self):
+        return self.journaled
+
+    def snapshot_cache_used(self):
+        if self.journaled:
+            # The journal was not replayed, but its records still count towards compaction
+            self.journal.resume()
+
+    def close(self):
+        # A running compaction rewrites the snapshot; let it finish before exiting
+        self.journal.wait_for_compaction()
+
+    def save_tasks(self, tasks):
+        if self.journaled:
+            # Every change is already in the journal; compaction rewrites the snapshot
+            logging.info(f"Tasks are journaled to {self.data_files['tasks_journal']}")
+            return True
+
+        path = self.data_files["tasks"]
+        # Only tasks changed since the last save are serialized again
+        fragments = {}
+        for task in tasks:
+            fragment = self._fragments.get(task.id)
+            if fragment is None or task.is_dirty:
+                fragment = "    " + json.dumps(task.to_dict(), indent=4).replace("\n", "\n    ")
+                task.mark_clean()
+            fragments[task.id] = fragment
+        self._fragments = fragments
+        texts = list(fragments.values())
+
+        def write():
+            text = "[\n" + ",\n".join(texts) + "\n]" if texts else "[]"
+            atomic_write(path, text)
+            self.journal.clear()
+            logging.info(f"Saved {len(texts)} tasks to {path}")
+            if self.snapshot_cache is not None:
+                # Built from the text just written, so the cache matches the file exactly
+                self.snapshot_cache.save([Task.from_dict(task_dict) for task_dict in json.loads(text)])
+
+        self._write_behind("tasks", write)
+        return True
+
+    def task_added(self, task):
+        self._record_change({"op": "add", "task": task.to_dict()})
+
+    def task_updated(self, task, fields):
+        self._record_change({"op": "update", "id": task.id, "fields": fields})
+
+    def task_deleted(self, task):
+        self._record_change({"op": "delete", "id": task.id})
+
+    def closed_tasks_deleted(self):
+        self._record_change({"op": "delete_closed"})
+
+    def _record_change(self, record):
+        """Append a task mutation to the journal when journaled storage is enabled"""
+        if self.journaled:
+            # Never coalesced: every record is appended, in order
+            self._write_behind(None, lambda: self.journal.append(record))
+
+    def load_tags(self):
+        self._flush_writes()
+        if not os.path.exists(self.data_files["tags"]):
+            return None
+        with open(self.data_files["tags"], "r") as file:
+            return json.load(file)
+
+    def save_tags(self, tags):
+        path = self.data_files["tags"]
+        tags = list(tags)
+
+        def write():
+            atomic_write_json(path, tags)
+            logging.info(f"Saved {len(tags)} tags to {path}")
+
+        self._write_behind("tags", write)
+        return True
+
+    def append_work_time(self, entry):
+        path = self.data_files["work_time"]
+        line = json.dumps(entry) + "\n"
+
+        def write():
+            if self._is_legacy_work_time(path):
+                self._convert_legacy_work_time(path)
+
+            # One JSON record per line, so each save is a single append
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+        self._write_behind(None, write)
+        return True
+
+    def load_work_time(self):
+        self._flush_writes()
+        path = self.data_files["work_time"]
+        if not os.path.exists(path):
+            return []
+        try:
+            if self._is_legacy_work_time(path):
+                with open(path, "r") as file:
+                    data = json.load(file)
+                return data if isinstance(data, list) else []
+            return list(self._read_work_time_lines(path))
+        except Exception as e:
+            logging.error(f"Error reading work time data: {e}", exc_info=True)
+            return []
+
+    @staticmethod
+    def _is_legacy_work_time(path):
+        """Check whether the work time file still holds a single JSON array"""
+        if not os.path.exists(path):
+            return False
+        with open(path, "r") as file:
+            while True:
+                chunk = file.read(1024)
+                if not chunk:
+                    return False
+                stripped = chunk.lstrip()
+                if stripped:
+                    return stripped[0] == "["
+
+    @staticmethod
+    def _read_work_time_lines(path):
+        """Yield work time entries from a JSON Lines file"""
+        with open(path, "r") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logging.warning(f"Skipping corrupt work time record in {path}")
+
+    @staticmethod
+    def _convert_legacy_work_time(path):
+        """Rewrite a legacy JSON array work time file as JSON Lines"""
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except Exception as e:
+            # Keep the unreadable file aside instead of appending records after it
+            logging.error(f"Error reading work time data: {e}", exc_info=True)
+            os.replace(path, path + ".corrupt")
+            return
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            for entry in data if isinstance(data, list) else []:
+                file.write(json.dumps(entry) + "\n")
+        os.replace(temp_path, path)
+        logging.info(f"Converted {path} to JSON Lines")
+
+def create_storage(backend=None):
+    """Factory method to create the configured storage backend"""
+    backend = backend or STORAGE_BACKEND
+    if backend == "sqlite":
+        from .sqlite_storage import SqliteStorage
+        return SqliteStorage(DATA_FILES["database"])
+    return JsonFileStorage(journaled=TASK_STORAGE_MODE == "journal")
@@ -0,0 +1,281 @@
+"""
+Append-only journal of task mutations
+"""
+import os
+import json
+import uuid
+import logging
+import threading
+
+from .json_stream import iter_json_array
+
+class TaskJournal:
+    """Write-ahead log of task mutations that is folded into the task snapshot"""
+
+    def __init__(self, journal_path, snapshot_path, compact_threshold=500):
+        self.journal_path = journal_path
+        self.compacting_path = journal_path + ".compacting"
+        self.snapshot_path = snapshot_path
+        self.folded_path = snapshot_path + ".folded"  # Folded snapshot waiting to replace the snapshot
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._record_count = 0
+        self._compaction_thread = None
+
+    def append(self, record):
+        """Append a single mutation record to the journal"""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+            with open(self.journal_path, "a") as file:
+                file.write(line)
+            self._record_count += 1
+            needs_compaction = self._record_count >= self.compact_threshold
+
+        if needs_compaction:
+            self.compact()
+
+    def load(self):
+        """Load the snapshot and replay pending journal records on top of it"""
+        self._recover_fold()
+        data = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as file:
+                snapshot = json.load(file)
+            data, changed = self._key_by_id(snapshot if isinstance(snapshot, list) else [])
+            if changed:
+                # Journal records refer to task ids, so they must be stable before any are written
+                self._write_snapshot(data)
+
+        # After _recover_fold a compacting log is never part of the snapshot yet
+        for record in self._read_records(self.compacting_path):
+            self.apply_record(data, record)
+
+        count = 0
+        for record in self._read_records(self.journal_path):
+            self.apply_record(data, record)
+            count += 1
+
+        with self._lock:
+            self._record_count = count
+
+        if count >= self.compact_threshold or os.path.exists(self.compacting_path):
+            self.compact()
+        return list(data.values())
+
+    def resume(self):
+        """Pick up the state of the journal files when the tasks were read from elsewhere, e.g. a cache
+
+        Counts the pending records without replaying them, so compaction still
+        runs once the journal reaches the threshold across sessions.
+        """
+        self._recover_fold()
+        count = sum(1 for _ in self._read_records(self.journal_path))
+        with self._lock:
+            self._record_count = count
+        if count >= self.compact_threshold or os.path.exists(self.compacting_path):
+            self.compact()
+
+    def load_batches(self, batch_size=1000):
+        """Yield the task dictionaries of load() in batches as the snapshot is parsed
+
+        Pending journal records may change any task, so with a non-empty journal
+        everything is loaded first and only then handed out in batches.
+        """
+        self._recover_fold()
+        if self._has_pending_records():
+            data = self.load()
+            for start in range(0, len(data), batch_size):
+                yield data[start:start + batch_size]
+            return
+
+        with self._lock:
+            self._record_count = 0
+        if not os.path.exists(self.snapshot_path):
+            return
+
+        seen = set()
+        assigned = {}  # Snapshot position -> id given to an entry without a unique one
+        batch = []
+        with open(self.snapshot_path, "r") as file:
+            for position, task_dict in enumerate(iter_json_array(file)):
+                task_id = task_dict.get("id")
+                if not task_id or task_id in seen:
+                    task_id = task_dict["id"] = assigned[position] = uuid.uuid4().hex
+                seen.add(task_id)
+                batch.append(task_dict)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+        if assigned:
+            # Journal records refer to task ids, so they must be stable before any are written
+            self._assign_snapshot_ids(assigned)
+
+    def _recover_fold(self):
+        """Finish or roll back a fold interrupted by a crash
+
+        Removing the compacting log is the fold's commit point: a folded
+        snapshot without its log is complete and replaces the snapshot, while
+        one whose log still exists is discarded and the log replayed instead.
+        """
+        self.wait_for_compaction()
+        if not os.path.exists(self.folded_path):
+            return
+        if os.path.exists(self.compacting_path):
+            os.remove(self.folded_path)
+        else:
+            os.replace(self.folded_path, self.snapshot_path)
+            logging.info(f"Completed an interrupted compaction of {self.snapshot_path}")
+
+    def _has_pending_records(self):
+        """Whether a journal or an unfinished compaction log holds records"""
+        return any(os.path.exists(path) and os.path.getsize(path) > 0
+                   for path in (self.journal_path, self.compacting_path))
+
+    def _assign_snapshot_ids(self, assigned):
+        """Rewrite the snapshot with ids given to entries by position, streaming it through"""
+        temp_path = self.snapshot_path + ".tmp"
+        with open(self.snapshot_path, "r") as source, open(temp_path, "w") as file:
+            file.write("[")
+            for position, task_dict in enumerate(iter_json_array(source)):
+                if position in assigned:
+                    task_dict["id"] = assigned[position]
+                file.write(",\n    " if position else "\n    ")
+                file.write(json.dumps(task_dict))
+            file.write("\n]")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+    def compact(self):
+        """Fold the journal into the snapshot on a background thread"""
+        with self._lock:
+            if self._compaction_thread and self._compaction_thread.is_alive():
+                return
+
+            # A leftover compacting log from a failed run is folded before rotating again
+            if not os.path.exists(self.compacting_path):
+                if not os.path.exists(self.journal_path):
+                    return
+                os.replace(self.journal_path, self.compacting_path)
+                self._record_count = 0
+
+            self._compaction_thread = threading.Thread(target=self._fold, name="TaskJournalCompaction")
+            self._compaction_thread.start()
+
+    def wait_for_compaction(self, timeout=None):
+        """Block until a running compaction has finished"""
+        thread = self._compaction_thread
+        if thread:
+            thread.join(timeout)
+
+    def clear(self):
+        """Discard the journal after the snapshot has been fully rewritten"""
+        self.wait_for_compaction()
+        with self._lock:
+            for path in (self.journal_path, self.compacting_path, self.folded_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._record_count = 0
+
+    @staticmethod
+    def apply_record(data, record):
+        """Apply one journal record to task dictionaries keyed by task id
+
+        Records are not idempotent (an update after delete_closed can change
+        what it deletes), so each record must be applied exactly once.
+        """
+        op = record.get("op")
+        task_id = record.get("id")
+
+        if op == "add":
+            task_dict = record["task"]
+            data[task_dict.get("id") or uuid.uuid4().hex] = task_dict
+        elif op == "delete":
+            data.pop(task_id, None)
+        elif op == "update":
+            if task_id in data:
+                data[task_id].update(record.get("fields", {}))
+        elif op == "delete_closed":
+            for closed_id in [key for key, task_dict in data.items() if task_dict.get("status") == "closed"]:
+                del data[closed_id]
+        else:
+            logging.warning(f"Ignoring unknown journal record: {op}")
+
+    def _fold(self):
+        """Replay the rotated journal onto the snapshot and replace it, committing by removing the log
+
+        Each step is atomic, and _recover_fold completes or undoes the fold
+        after a crash between them, so the log is never replayed twice.
+        """
+        try:
+            data = self._read_snapshot()
+            for record in self._read_records(self.compacting_path):
+                self.apply_record(data, record)
+
+            self._write_snapshot(data, self.folded_path)
+            os.remove(self.compacting_path)
+            self._sync_directory()
+            os.replace(self.folded_path, self.snapshot_path)
+            logging.info(f"Compacted task journal into {self.snapshot_path} ({len(data)} tasks)")
+        except Exception as e:
+            logging.error(f"Error compacting task journal: {e}", exc_info=True)
+
+    def _read_snapshot(self):
+        """Read the task snapshot file into task dictionaries keyed by id"""
+        if not os.path.exists(self.snapshot_path):
+            return {}
+        with open(self.snapshot_path, "r") as file:
+            data = json.load(file)
+        return self._key_by_id(data)[0] if isinstance(data, list) else {}
+
+    @staticmethod
+    def _key_by_id(task_dicts):
+        """Key task dictionaries by id, assigning ids to entries that lack a unique one"""
+        tasks = {}
+        changed = False
+        for task_dict in task_dicts:
+            task_id = task_dict.get("id")
+            if not task_id or task_id in tasks:
+                task_id = task_dict["id"] = uuid.uuid4().hex
+                changed = True
+            tasks[task_id] = task_dict
+        return tasks, changed
+
+    def _write_snapshot(self, data, path=None):
+        """Atomically replace the snapshot, or another file, with the given task dictionaries"""
+        path = path or self.snapshot_path
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(list(data.values()), file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        self._sync_directory()
+
+    def _sync_directory(self):
+        """Make renames and removals in the snapshot's directory durable, in order (POSIX only)"""
+        directory = os.path.dirname(self.snapshot_path)
+        if directory and hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+
+    @staticmethod
+    def _read_records(path):
+        """Yield the records of a journal file, skipping a torn trailing line"""
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logging.warning(f"Skipping corrupt journal record in {path}")
@@ -1,5 +1,32 @@
+import sys
 import json
+import uuid
 from datetime import datetime
+from types import MappingProxyType
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Days are stored as a bitmask; every combination maps to one shared tuple of names
+DAY_NAMES = WEEKDAY_NAMES + ("Free",)
+DAY_BITS = {day: 1 << bit for bit, day in enumerate(DAY_NAMES)}
+DAYS_BY_MASK = tuple(
+    tuple(day for day in DAY_NAMES if mask & DAY_BITS[day])
+    for mask in range(1 << len(DAY_NAMES))
+)
+
+# Shared read-only value for tasks without a recurrence pattern
+EMPTY_RECURRING = MappingProxyType({})
+
+# Modification timestamps are kept as strings in this format, which sort chronologically
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def format_timestamp(when=None):
+    """Format a datetime (default: now) the way Task.modified_at stores it"""
+    return (when or datetime.now()).strftime(TIMESTAMP_FORMAT)
+
+def current_day_name():
+    """Get the English name of today's weekday, matching the values in Task.days"""
+    return WEEKDAY_NAMES[datetime.now().weekday()]
 
 class Task:
     """Model representing a task in the scheduler"""
@@ -8,8 +35,14 @@ class Task:
     DAYS_OPTIONS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Free"]
     PRIORITY_OPTIONS = [0, 1, 2, 3]  # 0: Low, 1: Normal, 2: High, 3: Critical
     
+    __slots__ = ("id", "name", "details", "completed_today", "perceived_effort",
+                 "calculated_work_time", "priority", "_status", "_day_mask", "_tags", "_recurring",
+                 "modified_at", "_dirty_fields")
+    
     def __init__(self, name="", status="planned", days=None, details="", tags=None, 
-                 completed_today=False, perceived_effort=0, priority=1, recurring=None):
+                 completed_today=False, perceived_effort=0, priority=1, recurring=None, task_id=None,
+                 modified_at=None):
+        self.id = task_id or uuid.uuid4().hex  # Persistent unique identifier
         self.name = name
         self.status = status if status in self.STATUS_OPTIONS else "planned"
         self.days = days if days else ["Free"]
@@ -19,11 +52,80 @@ class Task:
         self.perceived_effort = perceived_effort
         self.calculated_work_time = 0
         self.priority = priority if priority in self.PRIORITY_OPTIONS else 1
-        self.recurring = recurring if recurring else {}  # Dict with recurrence pattern
+        self.recurring = recurring  # Dict with recurrence pattern
+        self.modified_at = modified_at if modified_at is not None else format_timestamp()  # "" when unknown
+        self._dirty_fields = None  # Fields changed since the last mark_clean()
+    
+    @property
+    def status(self):
+        return self._status
+    
+    @status.setter
+    def status(self, value):
+        self._status = sys.intern(value) if isinstance(value, str) else value
+    
+    @property
+    def days(self):
+        """Scheduled day names as a shared tuple, in week order"""
+        return DAYS_BY_MASK[self._day_mask]
+    
+    @days.setter
+    def days(self, days):
+        mask = 0
+        for day in days or ():
+            mask |= DAY_BITS.get(day, 0)
+        self._day_mask = mask
+    
+    @property
+    def day_mask(self):
+        """Scheduled days as a bitmask of DAY_BITS"""
+        return self._day_mask
+    
+    @property
+    def tags(self):
+        """Tag names as a tuple of interned strings"""
+        return self._tags
+    
+    @tags.setter
+    def tags(self, tags):
+        self._tags = tuple(sys.intern(tag) for tag in tags) if tags else ()
+    
+    @property
+    def recurring(self):
+        return self._recurring if self._recurring is not None else EMPTY_RECURRING
+    
+    @recurring.setter
+    def recurring(self, value):
+        self._recurring = dict(value) if value else None
+    
+    @property
+    def dirty_fields(self):
+        """Names of the fields changed since the task was last marked clean"""
+        return self._dirty_fields or frozenset()
+    
+    @property
+    def is_dirty(self):
+        return self._dirty_fields is not None
+    
+    def mark_modified(self, fields):
+        """Record that fields were just changed"""
+        self.modified_at = format_timestamp()
+        self._dirty_fields = self.dirty_fields | frozenset(fields)
+    
+    def mark_clean(self):
+        """Forget the changed fields, e.g. once they have been written"""
+        self._dirty_fields = None
+    
+    def modified_since(self, since):
+        """Check whether the task was modified at or after a datetime or timestamp string"""
+        if not isinstance(since, str):
+            since = format_timestamp(since)
+        # Same-second changes count, so nothing changed after since is missed
+        return self.modified_at >= since
     
     def is_for_today(self, include_free=True):
         """Check if task is scheduled for today"""
-        today = datetime.now().strftime("%A")
+        today = current_day_name()
         if today in self.days:
             return True
         return include_free and "Free" in self.days
@@ -31,16 +133,17 @@ class Task:
     def to_dict(self):
         """Convert task to dictionary for serialization"""
         return {
+            "id": self.id,
             "name": self.name,
             "status": self.status,
-            "days": self.days,
+            "days": list(self.days),
             "details": self.details,
-            "tags": self.tags,
+            "tags": list(self.tags),
             "completed_today": self.completed_today,
             "perceived_effort": self.perceived_effort,
             "priority": self.priority,
-            "recurring": self.recurring,
-            "save_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "recurring": dict(self.recurring),
+            "save_date": self.modified_at
         }
     
     @classmethod
@@ -55,9 +158,31 @@ class Task:
             completed_today=data.get("completed_today", False),
             perceived_effort=data.get("perceived_effort", 0),
             priority=data.get("priority", 1),
-            recurring=data.get("recurring", {})
+            recurring=data.get("recurring", {}),
+            task_id=data.get("id"),
+            modified_at=data.get("save_date") or ""
         )
     
+    @classmethod
+    def restore(cls, task_id, name, status, day_mask, details, tags, completed_today,
+                perceived_effort, priority, recurring, modified_at):
+        """Rebuild a task from values that were validated when they were stored, skipping __init__"""
+        task = cls.__new__(cls)
+        task.id = task_id
+        task.name = name
+        task._status = status
+        task._day_mask = day_mask
+        task.details = details
+        task._tags = tags
+        task.completed_today = completed_today
+        task.perceived_effort = perceived_effort
+        task.calculated_work_time = 0
+        task.priority = priority
+        task._recurring = recurring or None
+        task.modified_at = modified_at
+        task._dirty_fields = None
+        return task
+    
     def get_priority_label(self):
         """Get a human-readable priority label"""
         priority_labels = {
@@ -0,0 +1,232 @@
+"""
+Trigram full-text index over task names, tags and details
+"""
+import re
+import heapq
+import logging
+import threading
+from array import array
+from patterns.observer import Observer, ChangeEvent
+
+WORD_RE = re.compile(r"\w+")
+
+def trigrams(word):
+    """Get the set of three-character substrings of a word"""
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+class TrigramIndex(Observer):
+    """Ranked full-text search over task names, tags and details
+
+    Every distinct word is indexed once by its trigrams, and keeps a posting
+    list of the tasks containing it for each field. A query term is matched
+    against the vocabulary through the trigrams, so searching never scans the
+    task texts. The index is built on a background thread once the tasks are
+    loaded, adopted by the first use after it finishes, and then kept in step
+    with the model through change events.
+    """
+
+    FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "details": 1.0}
+    EVENTS = (ChangeEvent.TASK_ADDED, ChangeEvent.TASK_REMOVED,
+              ChangeEvent.TASK_UPDATED, ChangeEvent.TASKS_RELOADED)
+    COMPACT_MIN_DEAD = 1000
+
+    # Attributes holding the index itself, handed over from a background build
+    STATE = ("_doc_tasks", "_docs", "_dead", "_postings", "_vocabulary", "_trigram_words")
+
+    def __init__(self, tasks_source):
+        self._tasks_source = tasks_source  # Callable returning the current tasks
+        self._built = False
+        self._build = None  # TrigramIndex being filled on a worker thread
+        self._build_thread = None
+        self._queued_events = []  # (subject, events) received while building, replayed on adoption
+        self._failed = False  # Set on a background build that raised
+        self._reset()
+
+    def _reset(self):
+        self._doc_tasks = []  # Document number -> Task, or None once superseded
+        self._docs = {}  # Task id -> current document number
+        self._dead = 0
+        self._postings = {field: {} for field in self.FIELD_WEIGHTS}  # Field -> word -> document numbers
+        self._vocabulary = set()
+        self._trigram_words = {}  # Trigram -> words containing it
+
+    @property
+    def ready(self):
+        """Whether searches are answered, adopting a background build that has finished"""
+        self._adopt_build()
+        return self._built
+
+    @property
+    def building(self):
+        """Whether a background build is running or waiting to be adopted"""
+        return self._build is not None
+
+    def build_in_background(self):
+        """Index the current tasks on a worker thread; searches find nothing until it has finished"""
+        if self._built or self._build is not None:
+            return
+        tasks = list(self._tasks_source())
+        self._build = build = TrigramIndex(lambda: tasks)
+        self._queued_events = []
+        self._build_thread = threading.Thread(target=build._build_from, args=(tasks,),
+                                              name="TrigramIndexBuild", daemon=True)
+        self._build_thread.start()
+
+    def wait_for_build(self, timeout=None):
+        """Block until a running background build has finished, then adopt it"""
+        thread = self._build_thread
+        if thread:
+            thread.join(timeout)
+        return self.ready
+
+    def _build_from(self, tasks):
+        """Fill this fresh index on the worker thread; the owning index adopts it afterwards"""
+        try:
+            for task in tasks:
+                self._add(task)
+        except Exception as e:
+            # A task changed while it was read; the build is retried on the next use
+            logging.error(f"Error building the text index: {e}", exc_info=True)
+            self._failed = True
+        self._built = True
+
+    def _adopt_build(self):
+        """Take over a finished background build on the calling (UI) thread and catch up on changes"""
+        build = self._build
+        if build is None or not build._built:
+            return
+        self._build = self._build_thread = None
+        queued, self._queued_events = self._queued_events, []
+        if build._failed:
+            return
+        for name in self.STATE:
+            setattr(self, name, getattr(build, name))
+        self._built = True
+        for subject, events in queued:
+            self.update(subject, events)
+
+    def update(self, subject, events):
+        """Apply model change events to the index once it has been built
+
+        Changes made while a background build runs are replayed when it is
+        adopted; a reload starts a new build on the worker thread.
+        """
+        self._adopt_build()
+        if any(event.kind == ChangeEvent.TASKS_RELOADED for event in events):
+            self._built = False
+            self._build = self._build_thread = None
+            self._reset()
+            self.build_in_background()
+            return
+        if not self._built:
+            if self._build is not None:
+                self._queued_events.append((subject, events))
+            return
+        for event in events:
+            if event.kind == ChangeEvent.TASK_REMOVED:
+                self._remove(event.task_id)
+            elif event.kind == ChangeEvent.TASK_ADDED or (
+                    event.kind == ChangeEvent.TASK_UPDATED and event.fields & self.FIELD_WEIGHTS.keys()):
+                self._remove(event.task_id)
+                task = subject.get_task(event.task_id)
+                if task is not None:
+                    self._add(task)
+
+    def search(self, query, limit=None):
+        """Get tasks containing every word of the query, best matches first
+
+        Name matches rank above tag matches, which rank above details matches;
+        whole-word and prefix matches rank above matches inside a word.
+        """
+        terms = list(dict.fromkeys(WORD_RE.findall(query.lower())))
+        if not terms:
+            return []
+        if not self.ready:
+            # Never built on the UI thread; see ready for when results are available
+            self.build_in_background()
+            return []
+
+        scores = None
+        for term in terms:
+            term_scores = self._term_scores(term, scores)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+            if not scores:
+                return []
+
+        ranked = ((-score, doc) for doc, score in scores.items())
+        ranked = heapq.nsmallest(limit, ranked) if limit else sorted(ranked)
+        return [self._doc_tasks[doc] for _, doc in ranked]
+
+    def _term_scores(self, term, candidates=None):
+        """Score the live documents containing a term, optionally only among candidates"""
+        scores = {}
+        doc_tasks = self._doc_tasks
+        for word in self._matching_words(term):
+            if word == term:
+                boost = 1.5
+            elif word.startswith(term):
+                boost = 1.2
+            else:
+                boost = 1.0
+            for field, weight in self.FIELD_WEIGHTS.items():
+                docs = self._postings[field].get(word)
+                if not docs:
+                    continue
+                weight *= boost
+                for doc in docs:
+                    if doc_tasks[doc] is None or (candidates is not None and doc not in candidates):
+                        continue
+                    if weight > scores.get(doc, 0.0):
+                        scores[doc] = weight
+        return scores
+
+    def _matching_words(self, term):
+        """Get the indexed words that contain a term"""
+        if len(term) < 3:
+            return [word for word in self._vocabulary if term in word]
+        word_sets = []
+        for trigram in trigrams(term):
+            words = self._trigram_words.get(trigram)
+            if not words:
+                return []
+            word_sets.append(words)
+        word_sets.sort(key=len)
+        # Sharing every trigram is necessary but not sufficient, so confirm the substring
+        return [word for word in word_sets[0].intersection(*word_sets[1:]) if term in word]
+
+    def _add(self, task):
+        doc = len(self._doc_tasks)
+        self._doc_tasks.append(task)
+        self._docs[task.id] = doc
+        texts = {"name": task.name, "tags": " ".join(task.tags), "details": task.details or ""}
+        for field, text in texts.items():
+            postings = self._postings[field]
+            words = set(WORD_RE.findall(text.lower()))
+            for word in words.difference(postings):
+                postings[word] = array("I")
+                self._add_word(word)
+            for word in words:
+                postings[word].append(doc)
+
+    def _add_word(self, word):
+        if word in self._vocabulary:
+            return
+        self._vocabulary.add(word)
+        for trigram in trigrams(word):
+            self._trigram_words.setdefault(trigram, set()).add(word)
+
+    def _remove(self, task_id):
+        """Retire a task's document; posting lists are cleaned up by compaction"""
+        doc = self._docs.pop(task_id, None)
+        if doc is None:
+            return
+        self._doc_tasks[doc] = None
+        self._dead += 1
+        if self._dead >= self.COMPACT_MIN_DEAD and self._dead > len(self._docs):
+            live = [task for task in self._doc_tasks if task is not None]
+            self._reset()
+            for task in live:
+                self._add(task)
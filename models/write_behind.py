@@ -0,0 +1,140 @@
+"""
+Write-behind saving: file writes are coalesced and performed on a background thread
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import weakref
+import threading
+
+def atomic_write(path, text):
+    """Replace a file with text so that a crash leaves either the old or the new contents"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    if directory and hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable (POSIX only)
+        descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+def atomic_write_json(path, data):
+    """Replace a file with data serialized as indented JSON"""
+    atomic_write(path, json.dumps(data, indent=4))
+
+# Savers not closed yet; one exit hook flushes them all without keeping any of them alive
+_open_savers = weakref.WeakSet()
+
+@atexit.register
+def _close_open_savers():
+    for saver in list(_open_savers):
+        saver.close()
+
+class WriteBehindSaver:
+    """Runs pending writes on a background thread once they have waited for the coalescing window
+
+    Each write is registered under a key; registering another write for a key
+    that is still pending replaces it, so a burst of edits costs one write.
+    Writes registered with key None are never coalesced and run in order.
+    """
+
+    def __init__(self, delay=1.0):
+        self.delay = delay
+        self._pending = {}  # Key -> write callable, in registration order
+        self._first_dirty = None  # When the oldest pending write was registered
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="WriteBehindSaver", daemon=True)
+        self._thread.start()
+        _open_savers.add(self)
+
+    @property
+    def dirty(self):
+        """Whether writes are pending or in progress"""
+        with self._condition:
+            return bool(self._pending) or self._writing
+
+    def mark_dirty(self, key, write):
+        """Schedule write() to run on the saver thread, replacing a pending write for the same key
+
+        write must only use data captured when it was scheduled, or objects the
+        UI thread replaces rather than mutates in place.
+        """
+        with self._condition:
+            if self._closed:
+                # Late writes after close still happen, just synchronously
+                self._run_writes([write])
+                return
+            if key is None:
+                key = object()
+            self._pending[key] = write
+            if self._first_dirty is None:
+                self._first_dirty = time.monotonic()
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Run every pending write now and wait until they have finished"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._first_dirty = time.monotonic() - self.delay if self._pending else None
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self):
+        """Flush pending writes and stop the saver thread"""
+        if self._closed:
+            return
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        _open_savers.discard(self)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._pending:
+                        remaining = self._first_dirty + self.delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._closed and not self._pending:
+                    return
+                writes = list(self._pending.values())
+                self._pending = {}
+                self._first_dirty = None
+                self._writing = True
+
+            self._run_writes(writes)
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    @staticmethod
+    def _run_writes(writes):
+        for write in writes:
+            try:
+                write()
+            except Exception as e:
+                logging.error(f"Error in background save: {e}", exc_info=True)
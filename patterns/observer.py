@@ -1,28 +1,142 @@
+import weakref
+from contextlib import contextmanager
+
+class ChangeEvent:
+    """Typed description of a single change, passed to observers"""
+
+    # Generic change; observers should refresh everything they show
+    CHANGED = "changed"
+    TASK_ADDED = "task_added"
+    TASK_REMOVED = "task_removed"
+    TASK_UPDATED = "task_updated"
+    TASKS_RELOADED = "tasks_reloaded"
+    TAGS_CHANGED = "tags_changed"
+    TODAY_TASKS_SAVED = "today_tasks_saved"
+    WORK_TIME_SAVED = "work_time_saved"
+
+    __slots__ = ("kind", "task_id", "fields")
+
+    def __init__(self, kind, task_id=None, fields=()):
+        self.kind = kind
+        self.task_id = task_id
+        self.fields = frozenset(fields)
+
+    def __eq__(self, other):
+        return (isinstance(other, ChangeEvent) and self.kind == other.kind
+                and self.task_id == other.task_id and self.fields == other.fields)
+
+    def __hash__(self):
+        return hash((self.kind, self.task_id, self.fields))
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind!r}, task_id={self.task_id!r}, fields={sorted(self.fields)!r})"
+
 class Observer:
     """Observer interface"""
-    def update(self, subject):
-        """Update method called when subject changes"""
+    def update(self, subject, events):
+        """Update method called when subject changes, with the list of ChangeEvents"""
         pass
 
 class Subject:
-    """Subject that notifies observers of changes"""
-    
+    """Subject that notifies observers of changes
+
+    Observers are held through weak references, so attaching does not keep an
+    observer alive; it is detached once it is garbage collected. Observers that
+    are Qt objects are also detached when their C++ object is destroyed.
+    """
+
     def __init__(self):
-        self._observers = []
-    
-    def attach(self, observer):
-        """Attach an observer"""
-        if observer not in self._observers:
-            self._observers.append(observer)
-    
+        self._observers = {}  # id(observer) -> (weak reference, set of event kinds or None for all)
+        self._batch_depth = 0
+        self._pending_events = []
+
+    def attach(self, observer, kinds=None):
+        """Attach an observer, optionally only for the given event kinds
+
+        Generic CHANGED events are delivered to every observer.
+        """
+        key = id(observer)
+        kinds = set(kinds) if kinds is not None else None
+        entry = self._observers.get(key)
+        if entry is not None and entry[0]() is observer:
+            self._observers[key] = (entry[0], kinds)
+            return
+        subject = weakref.ref(self)
+
+        def forget(reference, key=key):
+            owner = subject()
+            if owner is not None and owner._observers.get(key, (None,))[0] is reference:
+                del owner._observers[key]
+
+        self._observers[key] = (weakref.ref(observer, forget), kinds)
+        destroyed = getattr(observer, "destroyed", None)
+        if destroyed is not None and hasattr(destroyed, "connect"):
+            destroyed.connect(lambda *args, reference=self._observers[key][0]: forget(reference))
+
     def detach(self, observer):
         """Detach an observer"""
+        entry = self._observers.get(id(observer))
+        if entry is not None and entry[0]() is observer:
+            del self._observers[id(observer)]
+
+    @property
+    def observer_count(self):
+        """Number of attached observers that are still alive"""
+        return sum(1 for reference, kinds in self._observers.values() if reference() is not None)
+
+    @contextmanager
+    def batch(self):
+        """Collect events until the outermost batch ends, then notify once"""
+        self._batch_depth += 1
         try:
-            self._observers.remove(observer)
-        except ValueError:
-            pass
-    
-    def notify(self):
-        """Notify all observers of a change"""
-        for observer in self._observers:
-            observer.update(self)
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_events:
+                events, self._pending_events = self._pending_events, []
+                self._dispatch(self._coalesce(events))
+
+    def notify(self, *events):
+        """Notify all observers of a change, described by zero or more ChangeEvents"""
+        events = list(events) or [ChangeEvent(ChangeEvent.CHANGED)]
+        if self._batch_depth:
+            self._pending_events.extend(events)
+            return
+        self._dispatch(self._coalesce(events))
+
+    @staticmethod
+    def _coalesce(events):
+        """Merge repeated events so each task and kind is reported once"""
+        merged = []
+        by_task = {}  # task id -> index of its pending added/updated event
+        seen = set()
+        for event in events:
+            if event.kind == ChangeEvent.TASK_UPDATED and event.task_id in by_task:
+                index = by_task[event.task_id]
+                previous = merged[index]
+                if previous.kind == ChangeEvent.TASK_UPDATED:
+                    merged[index] = ChangeEvent(previous.kind, previous.task_id,
+                                                previous.fields | event.fields)
+                continue
+            if event in seen:
+                continue
+            seen.add(event)
+            if event.kind in (ChangeEvent.TASK_ADDED, ChangeEvent.TASK_UPDATED):
+                by_task[event.task_id] = len(merged)
+            elif event.kind == ChangeEvent.TASK_REMOVED:
+                by_task.pop(event.task_id, None)
+            merged.append(event)
+        return merged
+
+    def _dispatch(self, events):
+        for reference, kinds in list(self._observers.values()):
+            observer = reference()
+            if observer is None:
+                continue
+            if kinds is None:
+                observer_events = events
+            else:
+                observer_events = [event for event in events
+                                   if event.kind in kinds or event.kind == ChangeEvent.CHANGED]
+            if observer_events:
+                observer.update(self, observer_events)
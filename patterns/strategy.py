@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from models.task_model import current_day_name
 
 class TaskFilterStrategy(ABC):
     """Strategy interface for task filtering"""
@@ -6,6 +7,10 @@ class TaskFilterStrategy(ABC):
     @abstractmethod
     def filter(self, tasks):
         pass
+    
+    def filter_model(self, model):
+        """Filter all tasks of a model; strategies may use the model's indexes instead"""
+        return self.filter(model.tasks)
 
 class TodayTasksFilter(TaskFilterStrategy):
     """Filter tasks scheduled for today"""
@@ -14,7 +19,12 @@ class TodayTasksFilter(TaskFilterStrategy):
         self.include_exceptions = include_exceptions
     
     def filter(self, tasks):
-        return [task for task in tasks if task.is_for_today(self.include_exceptions)]
+        today = current_day_name()
+        include_free = self.include_exceptions
+        return [task for task in tasks if today in task.days or (include_free and "Free" in task.days)]
+    
+    def filter_model(self, model):
+        return model.get_today_tasks(include_free=self.include_exceptions)
 
 class StatusTasksFilter(TaskFilterStrategy):
     """Filter tasks by status"""
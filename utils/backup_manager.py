@@ -31,6 +31,11 @@ class BackupManager:
                     shutil.copy(file_path, target_path)
                     logging.info(f"Backed up {key} to {target_path}")
             
+            # A journal that is being compacted still holds changes missing from the snapshot
+            compacting_path = DATA_FILES["tasks_journal"] + ".compacting"
+            if os.path.exists(compacting_path):
+                shutil.copy(compacting_path, os.path.join(backup_dir, os.path.basename(compacting_path)))
+            
             # Create a backup info file
             with open(os.path.join(backup_dir, "backup_info.json"), "w") as f:
                 info = {
@@ -81,6 +86,18 @@ class BackupManager:
         backups.sort(key=lambda b: b["dir"], reverse=True)
         return backups
     
+    @staticmethod
+    def last_backup_time():
+        """Get the time of the newest readable backup as "%Y-%m-%d %H:%M:%S", or None
+
+        The format matches Task.modified_at, so it can be passed straight to
+        ScheduleModel.get_tasks_changed_since.
+        """
+        for backup in BackupManager.list_backups():
+            if backup["datetime"][:1].isdigit():
+                return backup["datetime"]
+        return None
+    
     @staticmethod
     def restore_backup(backup_path):
         """Restore data from a backup"""
@@ -98,6 +115,16 @@ class BackupManager:
                 if os.path.exists(backup_file):
                     shutil.copy(backup_file, file_path)
                     logging.info(f"Restored {key} from backup")
+                elif key == "tasks_journal" and os.path.exists(file_path):
+                    # A journal left from the current data must not be replayed onto the restored tasks
+                    os.remove(file_path)
+            
+            compacting_path = DATA_FILES["tasks_journal"] + ".compacting"
+            backup_compacting = os.path.join(backup_path, os.path.basename(compacting_path))
+            if os.path.exists(backup_compacting):
+                shutil.copy(backup_compacting, compacting_path)
+            elif os.path.exists(compacting_path):
+                os.remove(compacting_path)
             
             logging.info(f"Backup restored successfully from {backup_path}")
             return True
@@ -23,9 +23,19 @@ DATA_FILES = {
     "tasks": os.path.join(CONFIG_DIR, "task_Lists.conf"),
     "tags": os.path.join(CONFIG_DIR, "tags.conf"),
     "work_time": os.path.join(CONFIG_DIR, "work_time.conf"),
-    "today_tasks": os.path.join(CONFIG_DIR, "todaytask.conf")
+    "today_tasks": os.path.join(CONFIG_DIR, "todaytask.conf"),
+    "tasks_journal": os.path.join(CONFIG_DIR, "task_Lists.journal"),
+    "tasks_cache": os.path.join(CONFIG_DIR, "task_Lists.cache"),
+    "database": os.path.join(CONFIG_DIR, "schedule.db")
 }
 
+# Storage settings
+STORAGE_BACKEND = "json"  # 'json' (.conf files) or 'sqlite' (schedule.db, migrated from .conf on first use)
+TASK_STORAGE_MODE = "journal"  # 'snapshot' (rewrite task_Lists.conf on save) or 'journal' (append changes)
+JOURNAL_COMPACT_THRESHOLD = 500  # Number of journal records before folding them into the snapshot
+AUTOSAVE_DELAY_SECONDS = 1.0  # Edits within this window are coalesced into one background write
+SNAPSHOT_CACHE_ENABLED = True  # Keep a binary copy of the task list (task_Lists.cache) for fast startup
+
 # Language settings
 DEFAULT_LANGUAGE = "en"  # 'en' for English, 'ja' for Japanese
 
@@ -4,25 +4,26 @@ Export data to Excel format
 import os
 import datetime
 import logging
+import importlib.util
 
-# Check for required dependencies
-EXCEL_AVAILABLE = True
-MISSING_DEPENDENCIES = []
+# Check for required dependencies without importing them; pandas alone takes
+# hundreds of milliseconds to import and export is rarely used
+REQUIRED_PACKAGES = ("pandas", "openpyxl")
+MISSING_DEPENDENCIES = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+EXCEL_AVAILABLE = not MISSING_DEPENDENCIES
 
-try:
-    import pandas as pd
-except ImportError:
-    EXCEL_AVAILABLE = False
-    MISSING_DEPENDENCIES.append("pandas")
-    pd = None
-    logging.error("pandas not installed. Excel export functionality unavailable.")
+for name in MISSING_DEPENDENCIES:
+    logging.error(f"{name} not installed. Excel export functionality unavailable.")
 
-try:
-    import openpyxl
-except ImportError:
-    EXCEL_AVAILABLE = False
-    MISSING_DEPENDENCIES.append("openpyxl")
-    logging.error("openpyxl not installed. Excel export functionality unavailable.")
+_pandas = None
+
+def _load_pandas():
+    """Import pandas on first use"""
+    global _pandas
+    if _pandas is None:
+        import pandas
+        _pandas = pandas
+    return _pandas
 
 # Fix the import to use the local config module
 from .config import EXPORT_DIR
@@ -31,8 +32,8 @@ class ExcelExporter:
     """Exports task data to Excel"""
     
     @staticmethod
-    def export_tasks(tasks, filename=None):
-        """Export tasks to Excel file"""
+    def export_tasks(tasks, filename=None, changed_since=None):
+        """Export tasks to Excel file, optionally only those modified since a datetime or timestamp"""
         if not EXCEL_AVAILABLE:
             error_msg = f"Required packages for Excel export are missing: {', '.join(MISSING_DEPENDENCIES)}"
             logging.error(error_msg)
@@ -45,6 +46,9 @@ class ExcelExporter:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
+        if changed_since is not None:
+            tasks = [task for task in tasks if task.modified_since(changed_since)]
+        
         # Convert tasks to dataframe
         data = []
         for task in tasks:
@@ -56,15 +60,17 @@ class ExcelExporter:
                 "Tags": ", ".join(task.tags),
                 "Details": task.details,
                 "Completed Today": task.completed_today,
-                "Perceived Effort": task.perceived_effort
+                "Perceived Effort": task.perceived_effort,
+                "Modified": task.modified_at
             })
         
         if not data:
             data.append({
                 "Name": "", "Status": "", "Priority": "", "Days": "", 
-                "Tags": "", "Details": "", "Completed Today": "", "Perceived Effort": ""
+                "Tags": "", "Details": "", "Completed Today": "", "Perceived Effort": "", "Modified": ""
             })
             
+        pd = _load_pandas()
         df = pd.DataFrame(data)
         
         try:
@@ -91,6 +97,7 @@ class ExcelExporter:
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
         try:
+            pd = _load_pandas()
             if isinstance(work_time_data, list):
                 # Handle list of work time entries
                 writer = pd.ExcelWriter(filename, engine='openpyxl')
@@ -0,0 +1,108 @@
+"""
+Startup profiling: wall time per launch phase and time to the first paint
+"""
+import os
+import json
+import time
+import logging
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime
+
+from PyQt5.QtCore import QObject, QEvent
+
+from .config import LOG_DIR
+
+class StartupProfiler:
+    """Records wall time of startup phases until the main window is first painted"""
+
+    def __init__(self, enabled=False, start_time=None, use_cprofile=False, report_dir=None):
+        self.enabled = enabled
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.report_dir = report_dir or LOG_DIR
+        self.phases = []  # (name, start offset, duration) in seconds
+        self.first_paint = None
+        self._paint_filter = None
+        self._profile = cProfile.Profile() if enabled and use_cprofile else None
+        if self._profile:
+            self._profile.enable()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a named startup phase"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            self.phases.append((name, started - self.start_time, ended - started))
+
+    def mark(self, name):
+        """Record a phase that ran from the end of the previous one until now"""
+        if not self.enabled:
+            return
+        previous_end = self.phases[-1][1] + self.phases[-1][2] if self.phases else 0.0
+        now = time.perf_counter() - self.start_time
+        self.phases.append((name, previous_end, now - previous_end))
+
+    def watch_first_paint(self, widget):
+        """Finish profiling when the widget receives its first paint event"""
+        if not self.enabled:
+            return
+        self._paint_filter = _FirstPaintFilter(self._on_first_paint)
+        widget.installEventFilter(self._paint_filter)
+
+    def _on_first_paint(self, widget):
+        widget.removeEventFilter(self._paint_filter)
+        self.first_paint = time.perf_counter() - self.start_time
+        self.finish()
+
+    def finish(self):
+        """Stop profiling, log the breakdown and write the JSON report"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.report_dir, exist_ok=True)
+        report = {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "phases": [
+                {"name": name, "start_ms": round(start * 1000, 1), "duration_ms": round(duration * 1000, 1)}
+                for name, start, duration in self.phases
+            ],
+            "first_paint_ms": round(self.first_paint * 1000, 1) if self.first_paint is not None else None
+        }
+
+        if self._profile:
+            self._profile.disable()
+            profile_path = os.path.join(self.report_dir, f"startup_{stamp}.prof")
+            self._profile.dump_stats(profile_path)
+            report["cprofile"] = profile_path
+
+        for phase in report["phases"]:
+            logging.info(f"Startup phase {phase['name']}: {phase['duration_ms']} ms (at {phase['start_ms']} ms)")
+        logging.info(f"Startup time to first paint: {report['first_paint_ms']} ms")
+
+        report_path = os.path.join(self.report_dir, f"startup_{stamp}.json")
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=4)
+        logging.info(f"Startup profile written to {report_path}")
+        return report_path
+
+class _FirstPaintFilter(QObject):
+    """Event filter calling back on the first paint event of a widget"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+        self._done = False
+
+    def eventFilter(self, obj, event):
+        if not self._done and event.type() == QEvent.Paint:
+            self._done = True
+            self._callback(obj)
+        return False
@@ -1,22 +1,29 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QPushButton, QLabel, QTableWidget, QTableWidgetItem,
+                            QPushButton, QLabel, QTableView, QAbstractItemView,
                             QHeaderView, QDialog, QFormLayout, QLineEdit, 
                             QTextEdit, QComboBox, QCheckBox, QGroupBox,
-                            QMessageBox)
-from PyQt5.QtCore import Qt
+                            QMessageBox, QAction)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence
 # Remove Observer import
 from models.task_model import Task
 from views.tag_edit_view import TagEditDialog
+from views.table_models import AllScheduleTableModel, TaskFilterProxyModel
+from views.delegates import ButtonDelegate
+from views.builders.theme_service import ThemeService, set_theme_font, apply_theme_fonts
 
 class AllScheduleView(QMainWindow):
     """View for editing all scheduled tasks"""
     
+    SEARCH_DELAY_MS = 200
+    
     def __init__(self, theme_factory):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        ThemeService.instance().theme_changed.connect(self.apply_theme)
         
         self.controller = None
         self.tasks = []
@@ -43,31 +50,76 @@ class AllScheduleView(QMainWindow):
         """Set available tags"""
         self.tags = tags
     
+    def apply_theme(self, theme):
+        """Use the compiled colours and fonts of a newly applied theme"""
+        self.theme_factory = theme.factory
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        apply_theme_fonts(self, self.fonts)
+    
+    def reset_state(self):
+        """Clear the search and sort order, as in a newly built view, before the view is reused"""
+        self.search_timer.stop()
+        self.search_box.blockSignals(True)
+        self.search_box.clear()
+        self.search_box.blockSignals(False)
+        self.proxy_model.set_matching_ids(None)
+        self.task_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.task_table.scrollToTop()
+    
     def build_header(self):
         """Build the header section"""
         header_layout = QHBoxLayout()
         
         title_label = QLabel("All Schedules")
-        title_label.setFont(self.fonts["header"])
+        set_theme_font(title_label, self.fonts, "header")
         header_layout.addWidget(title_label)
         
         # Add search box to All Schedules view
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Search tasks...")
         self.search_box.setMaximumWidth(200)
-        self.search_box.textChanged.connect(self.search_tasks)
         header_layout.addWidget(self.search_box)
         
+        # Search once typing pauses instead of on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(lambda: self.search_tasks(self.search_box.text()))
+        self.search_box.textChanged.connect(self.search_timer.start)
+        
+        # Search (Ctrl+F)
+        search_shortcut = QAction("Search", self)
+        search_shortcut.setShortcut(QKeySequence("Ctrl+F"))
+        search_shortcut.triggered.connect(self.search_box.setFocus)
+        self.addAction(search_shortcut)
+        
         self.main_layout.addLayout(header_layout)
     
     def build_content(self):
         """Build the main content section with task table"""
-        # Task table
-        self.task_table = QTableWidget()
-        self.task_table.setColumnCount(6)  # Name, Status, Days, Tags, Edit, Delete
-        self.task_table.setHorizontalHeaderLabels(["Task Name", "Status", "Days", "Tags", "Edit", "Delete"])
+        # Task table: source model -> sort/filter proxy -> view
+        self.task_model = AllScheduleTableModel(self)
+        self.proxy_model = TaskFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.task_model)
+        
+        self.task_table = QTableView()
+        self.task_table.setModel(self.proxy_model)
+        self.task_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.task_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.task_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.task_table.setSelectionBehavior(QTableWidget.SelectRows)
+        
+        # No sort column until a header is clicked, so tasks start in schedule order
+        self.task_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.task_table.setSortingEnabled(True)
+        
+        # Edit/delete buttons are painted by delegates instead of one widget per row
+        self.edit_delegate = ButtonDelegate("編集", self.task_table)
+        self.edit_delegate.clicked.connect(self.edit_task_at)
+        self.task_table.setItemDelegateForColumn(AllScheduleTableModel.EDIT, self.edit_delegate)
+        self.delete_delegate = ButtonDelegate("削除", self.task_table)
+        self.delete_delegate.clicked.connect(self.delete_task_at)
+        self.task_table.setItemDelegateForColumn(AllScheduleTableModel.DELETE, self.delete_delegate)
         self.main_layout.addWidget(self.task_table)
     
     def build_footer(self):
@@ -98,41 +150,31 @@ class AllScheduleView(QMainWindow):
     
     def update_task_table(self):
         """Update the task table with current tasks"""
-        self.task_table.setRowCount(0)  # Clear existing rows
-
-        for idx, task in enumerate(self.tasks):
-            self.task_table.insertRow(idx)
-            
-            # Name column
-            name_item = QTableWidgetItem(task.name)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
-            self.task_table.setItem(idx, 0, name_item)
-            
-            # Status column
-            status_item = QTableWidgetItem(task.status)
-            status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
-            self.task_table.setItem(idx, 1, status_item)
-            
-            # Days column
-            days_item = QTableWidgetItem(", ".join(task.days))
-            days_item.setFlags(days_item.flags() & ~Qt.ItemIsEditable)
-            self.task_table.setItem(idx, 2, days_item)
-            
-            # Tags column
-            tags_item = QTableWidgetItem(", ".join(task.tags))
-            tags_item.setFlags(tags_item.flags() & ~Qt.ItemIsEditable)
-            self.task_table.setItem(idx, 3, tags_item)
-            
-            # Edit button
-            edit_btn = QPushButton("編集")
-            edit_btn.clicked.connect(lambda _, t=task: self.show_edit_task_dialog(t))
-            self.task_table.setCellWidget(idx, 4, edit_btn)
-            
-            # Delete button
-            delete_btn = QPushButton("削除")
-            delete_btn.clicked.connect(lambda _, t=task: self.delete_task(t))
-            self.task_table.setCellWidget(idx, 5, delete_btn)
+        # Rows are fetched in batches as the table scrolls, so this stays cheap for large schedules
+        self.task_model.set_tasks(self.tasks)
+        if self.search_box.text().strip():
+            self.search_tasks(self.search_box.text())
+    
+    def update_task_rows(self, tasks):
+        """Repaint the rows of the given tasks and re-apply the search to them"""
+        self.task_model.refresh_tasks(tasks)
+        if self.search_box.text().strip():
+            self.search_tasks(self.search_box.text())
+    
+    def edit_task_at(self, index):
+        """Open the edit dialog for the task in the clicked row"""
+        task = self.proxy_model.task_at(index)
+        if task:
+            self.show_edit_task_dialog(task)
     
+    def delete_task_at(self, index):
+        """Delete the task in the clicked row"""
+        task = self.proxy_model.task_at(index)
+        if task:
+            self.delete_task(task)
+    
+    # Task edits notify the model, and MainController refreshes this view from it
+
     def show_add_task_dialog(self):
         """Show dialog for adding a new task"""
         dialog = TaskDialog(self.theme_factory, None, self.tags)
@@ -146,7 +188,6 @@ class AllScheduleView(QMainWindow):
                 tags=[dialog.tags_combo.currentText()]
             )
             self.controller.add_task(task)
-            self.update_task_table()
     
     def show_edit_task_dialog(self, task):
         """Show dialog for editing an existing task"""
@@ -161,7 +202,6 @@ class AllScheduleView(QMainWindow):
                 "tags": [dialog.tags_combo.currentText()]
             }
             self.controller.update_task(task, attributes)
-            self.update_task_table()
     
     def delete_task(self, task):
         """Delete a single task"""
@@ -172,7 +212,6 @@ class AllScheduleView(QMainWindow):
         
         if confirm == QMessageBox.Yes:
             self.controller.delete_task(task)
-            self.update_task_table()
     
     def delete_closed_tasks(self):
         """Delete all closed tasks"""
@@ -188,7 +227,6 @@ class AllScheduleView(QMainWindow):
         
         if confirm == QMessageBox.Yes:
             self.controller.delete_closed_tasks()
-            self.update_task_table()
     
     def show_tags_dialog(self):
         """Show dialog for editing tags"""
@@ -218,38 +256,18 @@ class AllScheduleView(QMainWindow):
 
     def search_tasks(self, text):
         """Filter tasks based on search text"""
-        if not text.strip():
-            # If search is empty, show all rows
-            for row in range(self.task_table.rowCount()):
-                self.task_table.setRowHidden(row, False)
+        # Matches come from the model's search index, not from the table cells
+        if not text.strip() or not self.controller:
+            self.proxy_model.set_matching_ids(None)
+            self.statusBar().clearMessage()
             return
-        
-        # Otherwise, hide rows that don't match the search text
-        text = text.lower()
-        for row in range(self.task_table.rowCount()):
-            show_row = False
-            
-            # Check task name
-            name_item = self.task_table.item(row, 0)
-            if name_item and text in name_item.text().lower():
-                show_row = True
-                
-            # Check task status
-            status_item = self.task_table.item(row, 1)
-            if status_item and text in status_item.text().lower():
-                show_row = True
-                
-            # Check task days
-            days_item = self.task_table.item(row, 2)
-            if days_item and text in days_item.text().lower():
-                show_row = True
-                
-            # Check task tags
-            tags_item = self.task_table.item(row, 3)
-            if tags_item and text in tags_item.text().lower():
-                show_row = True
-                
-            self.task_table.setRowHidden(row, not show_row)
+        self.proxy_model.set_matching_ids(self.controller.search_task_ids(text))
+        if self.controller.text_search_ready():
+            self.statusBar().clearMessage()
+        else:
+            # Matches in details come from the text index, built in the background; search again shortly
+            self.statusBar().showMessage("Building search index...")
+            self.search_timer.start()
 
 class TaskDialog(QDialog):
     """Dialog for adding or editing a task"""
@@ -257,9 +275,9 @@ class TaskDialog(QDialog):
     def __init__(self, theme_factory, task=None, tags=None):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
         
         self.task = task
         self.tags = tags or []
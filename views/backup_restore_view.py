@@ -6,6 +6,7 @@ import logging
 from PyQt5.QtCore import Qt, QDate, QTimer
 from utils.backup_manager import BackupManager
 from utils.error_handler import ErrorHandler
+from views.builders.theme_service import ThemeService
 
 class BackupRestoreDialog(QDialog):
     """Dialog for selecting and restoring backups"""
@@ -13,9 +14,9 @@ class BackupRestoreDialog(QDialog):
     def __init__(self, theme_factory, parent=None):
         super().__init__(parent)
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
         
         self.setWindowTitle("Restore Backup")
         self.setMinimumSize(600, 400)
@@ -5,6 +5,8 @@ from PyQt5.QtCore import Qt
 class AbstractThemeFactory(ABC):
     """Abstract factory interface for creating theme components"""
     
+    name = None  # Theme name, as used in UI_THEME
+    
     @abstractmethod
     def create_color_scheme(self):
         """Create color scheme for the theme"""
@@ -32,10 +34,13 @@ class AbstractThemeFactory(ABC):
 class LightThemeFactory(AbstractThemeFactory):
     """Concrete factory for light theme"""
     
+    name = "light"
+    
     def create_color_scheme(self):
         return {
             "background": QColor(240, 240, 240),
             "foreground": QColor(50, 50, 50),
+            "base": QColor(255, 255, 255),
             "primary": QColor(66, 133, 244),
             "secondary": QColor(234, 234, 234),
             "accent": QColor(255, 152, 0),
@@ -106,10 +111,13 @@ class LightThemeFactory(AbstractThemeFactory):
 class DarkThemeFactory(AbstractThemeFactory):
     """Concrete factory for dark theme"""
     
+    name = "dark"
+    
     def create_color_scheme(self):
         return {
             "background": QColor(40, 40, 40),
             "foreground": QColor(220, 220, 220),
+            "base": QColor(64, 64, 64),
             "primary": QColor(66, 133, 244),
             "secondary": QColor(60, 60, 60),
             "accent": QColor(255, 152, 0),
@@ -0,0 +1,119 @@
+"""
+Application-wide theme service: each theme is compiled once and applied to the whole application
+"""
+import logging
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QPalette
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from utils.config import UI_THEME
+from .theme_factory import AbstractThemeFactory
+
+FONT_ROLE_PROPERTY = "themeFontRole"
+
+def set_theme_font(widget, fonts, role):
+    """Give a widget the theme font of a role ("header", "normal" or "button"), remembering the role"""
+    widget.setProperty(FONT_ROLE_PROPERTY, role)
+    widget.setFont(fonts[role])
+
+def apply_theme_fonts(root, fonts):
+    """Re-apply theme fonts to a widget and its children set up with set_theme_font"""
+    for widget in [root, *root.findChildren(QWidget)]:
+        role = widget.property(FONT_ROLE_PROPERTY)
+        if role in fonts:
+            widget.setFont(fonts[role])
+
+class CompiledTheme:
+    """A theme's stylesheet, palette, colours, brushes and fonts, built once and shared by every view"""
+
+    __slots__ = ("name", "factory", "style_sheet", "palette", "colors", "brushes", "fonts")
+
+    def __init__(self, factory):
+        self.name = factory.name
+        self.factory = factory
+        self.style_sheet = factory.create_style_sheet()
+        self.colors = factory.create_color_scheme()
+        self.brushes = {key: QBrush(color) for key, color in self.colors.items()}
+        self.fonts = factory.create_font_scheme()
+        self.palette = self._build_palette(self.colors)
+
+    @staticmethod
+    def _build_palette(colors):
+        """Palette for what the stylesheet does not cover, e.g. views painted by delegates"""
+        palette = QPalette()
+        roles = {
+            QPalette.Window: colors["background"],
+            QPalette.WindowText: colors["foreground"],
+            QPalette.Base: colors["base"],
+            QPalette.AlternateBase: colors["secondary"],
+            QPalette.Text: colors["foreground"],
+            QPalette.Button: colors["secondary"],
+            QPalette.ButtonText: colors["foreground"],
+            QPalette.ToolTipBase: colors["base"],
+            QPalette.ToolTipText: colors["foreground"],
+            QPalette.Highlight: colors["primary"],
+            QPalette.HighlightedText: QColor(255, 255, 255),
+        }
+        for role, color in roles.items():
+            palette.setColor(role, color)
+        return palette
+
+class ThemeService(QObject):
+    """Compiles themes on first use and applies the current one application-wide
+
+    Widgets get the stylesheet, palette and default font from the application
+    instead of their own, so switching themes re-styles every open view in
+    place; views re-apply the fonts of their own widgets on theme_changed.
+    """
+
+    theme_changed = pyqtSignal(object)  # CompiledTheme now applied
+
+    _shared = None
+
+    def __init__(self, theme_name=UI_THEME):
+        super().__init__()
+        self._themes = {}  # Theme name -> CompiledTheme
+        self._current_name = theme_name
+
+    @classmethod
+    def instance(cls):
+        """The service shared by the whole application"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def theme(self, name=None):
+        """Return the compiled theme of the given name, or of the current theme"""
+        factory = AbstractThemeFactory.create_theme_factory(name or self._current_name)
+        theme = self._themes.get(factory.name)
+        if theme is None:
+            theme = self._themes[factory.name] = CompiledTheme(factory)
+        return theme
+
+    @property
+    def current(self):
+        """The compiled current theme"""
+        return self.theme()
+
+    @property
+    def factory(self):
+        """Theme factory of the current theme, for building views"""
+        return self.current.factory
+
+    def apply(self, name=None):
+        """Make a theme current and apply it to the application, re-styling open views"""
+        theme = self.theme(name)
+        self._current_name = theme.name
+        app = QApplication.instance()
+        if app is not None:
+            app.setPalette(theme.palette)
+            app.setFont(theme.fonts["normal"])
+            app.setStyleSheet(theme.style_sheet)
+        logging.info(f"Applied theme {theme.name}")
+        self.theme_changed.emit(theme)
+        return theme
+
+    def toggle(self):
+        """Switch between the light and dark themes"""
+        return self.apply("light" if self._current_name == "dark" else "dark")
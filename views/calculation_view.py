@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                             QPushButton, QLineEdit, QTableWidget, QTableWidgetItem,
                             QHeaderView, QMessageBox, QDoubleSpinBox)
 from PyQt5.QtCore import Qt
+from views.builders.theme_service import ThemeService
 
 class CalculationView(QDialog):
     """View for calculating and displaying work time distribution"""
@@ -9,9 +10,9 @@ class CalculationView(QDialog):
     def __init__(self, theme_factory, tasks, controller):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
         
         self.tasks = tasks
         self.controller = controller
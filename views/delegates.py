@@ -0,0 +1,77 @@
+from PyQt5.QtWidgets import (QStyledItemDelegate, QComboBox, QSpinBox, QStyle,
+                            QStyleOptionButton, QApplication)
+from PyQt5.QtCore import Qt, QEvent, QModelIndex, pyqtSignal
+
+class ComboBoxDelegate(QStyledItemDelegate):
+    """Delegate editing a cell with a combo box of (label, value) choices"""
+
+    def __init__(self, choices, parent=None):
+        super().__init__(parent)
+        self.choices = choices
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        for label, value in self.choices:
+            editor.addItem(label, value)
+        # Apply the choice immediately, like the per-row combo boxes did
+        editor.activated.connect(lambda _: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        position = editor.findData(index.data(Qt.EditRole))
+        editor.setCurrentIndex(max(position, 0))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentData(), Qt.EditRole)
+
+class SpinBoxDelegate(QStyledItemDelegate):
+    """Delegate editing an integer cell with a spin box"""
+
+    def __init__(self, minimum=0, maximum=100, parent=None):
+        super().__init__(parent)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def createEditor(self, parent, option, index):
+        editor = QSpinBox(parent)
+        editor.setRange(self.minimum, self.maximum)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setValue(index.data(Qt.EditRole) or 0)
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.EditRole)
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Delegate that paints a push button in each cell and reports clicks"""
+
+    clicked = pyqtSignal(QModelIndex)
+
+    def __init__(self, text=None, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self._pressed = None  # (row, column) of the button held down
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = self.text if self.text is not None else str(index.data() or "")
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        if self._pressed == (index.row(), index.column()):
+            button.state |= QStyle.State_Sunken
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self._pressed = (index.row(), index.column())
+            return True
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pressed, self._pressed = self._pressed, None
+            if pressed == (index.row(), index.column()) and option.rect.contains(event.pos()):
+                self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -1,26 +1,33 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QPushButton,
-                            QLabel, QGroupBox, QHBoxLayout, QTableWidget,
-                            QTableWidgetItem, QComboBox, QSpinBox, QCheckBox,
-                            QMessageBox, QHeaderView, QLineEdit, QMenu,
-                            QAction)
+                            QLabel, QGroupBox, QHBoxLayout, QTableView,
+                            QAbstractItemView, QMessageBox, QHeaderView,
+                            QLineEdit, QMenu, QAction, QListWidget,
+                            QListWidgetItem)
 from PyQt5.QtCore import Qt, QDate, QTimer
-from PyQt5.QtGui import QKeySequence, QIcon, QColor  # Added QColor import here
+from PyQt5.QtGui import QKeySequence, QIcon
 import locale
 from datetime import datetime
 import os
-import logging
 
 from utils.error_handler import ErrorHandler
+from views.table_models import TodayTaskTableModel
+from views.delegates import ComboBoxDelegate, SpinBoxDelegate, ButtonDelegate
+from views.builders.theme_service import ThemeService, set_theme_font, apply_theme_fonts
 
 class MainView(QMainWindow):
     """Main view of the scheduler application"""
     
+    SEARCH_DELAY_MS = 200
+    SEARCH_RESULT_LIMIT = 20
+    
     def __init__(self, theme_factory):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        # Compiled once per theme; the stylesheet and palette are applied application-wide
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        ThemeService.instance().theme_changed.connect(self.apply_theme)
         
         self.setWindowTitle("Task Scheduler")
         self.setMinimumSize(800, 600)
@@ -36,8 +43,13 @@ class MainView(QMainWindow):
         self.calculate_button = None
         self.excel_export_button = None
         self.task_table = None
+        self.task_model = None
         self.date_label = None
         self.theme_toggle = None
+        self.search_box = None
+        self.search_results = None
+        self.loading_label = None
+        self._loading_disabled = []  # Widgets disabled by set_loading, re-enabled when done
         
         # Set up timer for date updates
         self.timer = QTimer(self)
@@ -77,6 +89,49 @@ class MainView(QMainWindow):
         """Focus the search box"""
         if self.search_box:
             self.search_box.setFocus()
+            self.search_box.selectAll()
+    
+    def run_search(self):
+        """Show the best full-text matches for the search box text"""
+        text = self.search_box.text()
+        self.search_results.clear()
+        if not text.strip() or not hasattr(self, 'task_detail_controller'):
+            self.search_results.setVisible(False)
+            return
+        
+        tasks = self.task_detail_controller.search_tasks(text, self.SEARCH_RESULT_LIMIT)
+        if not self.task_detail_controller.text_search_ready():
+            # The index is built in the background; try again shortly instead of blocking
+            item = QListWidgetItem("Building search index...")
+            item.setFlags(Qt.NoItemFlags)
+            self.search_results.addItem(item)
+            self.search_results.setVisible(True)
+            self.search_timer.start()
+            return
+        for task in tasks:
+            label = f"{task.name}  [{', '.join(task.tags)}]" if task.tags else task.name
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, task.id)
+            self.search_results.addItem(item)
+        if not tasks:
+            item = QListWidgetItem("No matching tasks")
+            item.setFlags(Qt.NoItemFlags)
+            self.search_results.addItem(item)
+        self.search_results.setVisible(True)
+    
+    def open_search_result(self, item):
+        """Open the detail view of a search result"""
+        task_id = item.data(Qt.UserRole)
+        task = self.task_detail_controller.get_task(task_id) if task_id else None
+        if task:
+            self.show_task_detail(task)
+    
+    def open_first_search_result(self):
+        """Open the best match when Enter is pressed in the search box"""
+        self.search_timer.stop()
+        self.run_search()
+        if self.search_results.count():
+            self.open_search_result(self.search_results.item(0))
     
     def build_header(self):
         """Build the header section with title and navigation buttons"""
@@ -84,7 +139,7 @@ class MainView(QMainWindow):
         
         # Date label (top left)
         self.date_label = QLabel()
-        self.date_label.setFont(self.fonts["normal"])
+        set_theme_font(self.date_label, self.fonts, "normal")
         self.update_date_label()  # Set initial date
         header_layout.addWidget(self.date_label)
         
@@ -92,9 +147,22 @@ class MainView(QMainWindow):
         
         # Title
         title_label = QLabel("Task Scheduler")
-        title_label.setFont(self.fonts["header"])
+        set_theme_font(title_label, self.fonts, "header")
         header_layout.addWidget(title_label)
         
+        # Full-text search box (Ctrl+F); results are shown below the header
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search tasks (Ctrl+F)")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setMaximumWidth(250)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_box.textChanged.connect(self.search_timer.start)
+        self.search_box.returnPressed.connect(self.open_first_search_result)
+        header_layout.addWidget(self.search_box)
+        
         # Theme toggle
         self.theme_toggle = QPushButton("🌙 / ☀️")  # Moon/sun icons
         self.theme_toggle.setToolTip("Toggle dark/light theme")
@@ -106,30 +174,54 @@ class MainView(QMainWindow):
         button_layout = QHBoxLayout()
         
         self.today_task_button = QPushButton("Today's Tasks")
-        self.today_task_button.setFont(self.fonts["button"])
+        set_theme_font(self.today_task_button, self.fonts, "button")
         self.today_task_button.setToolTip("Edit today's tasks (Ctrl+T)")
         button_layout.addWidget(self.today_task_button)
         
         self.all_schedule_button = QPushButton("All Schedules")
-        self.all_schedule_button.setFont(self.fonts["button"])
+        set_theme_font(self.all_schedule_button, self.fonts, "button")
         self.all_schedule_button.setToolTip("View and edit all scheduled tasks (Ctrl+A)")
         button_layout.addWidget(self.all_schedule_button)
         
         header_layout.addStretch(1)  # Add stretch to push buttons to right
         header_layout.addLayout(button_layout)
         self.main_layout.addLayout(header_layout)
+        
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(200)
+        self.search_results.setVisible(False)
+        self.search_results.itemActivated.connect(self.open_search_result)
+        self.main_layout.addWidget(self.search_results)
     
     def build_content(self):
         """Build the main content section with today's tasks"""
         # Today's tasks group
         tasks_group = QGroupBox("Today's Tasks Window")
-        tasks_group.setFont(self.fonts["normal"])
+        set_theme_font(tasks_group, self.fonts, "normal")
         tasks_layout = QVBoxLayout(tasks_group)
         
-        # Task table
-        self.task_table = QTableWidget()
-        self.task_table.setColumnCount(5)
-        self.task_table.setHorizontalHeaderLabels(["Task Name", "Status", "Effort", "Completed", "Details"])
+        # Shown above the table while the schedule streams in from the background
+        self.loading_label = QLabel("Loading tasks...")
+        set_theme_font(self.loading_label, self.fonts, "normal")
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        self.loading_label.setVisible(False)
+        tasks_layout.addWidget(self.loading_label)
+        
+        # Task table backed by a model; cells are painted, editors exist only while editing
+        self.task_model = TodayTaskTableModel(self)
+        self.task_model.attribute_edited.connect(self.update_task_attribute)
+        
+        self.task_table = QTableView()
+        self.task_table.setModel(self.task_model)
+        self.task_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.task_table.setItemDelegateForColumn(
+            TodayTaskTableModel.STATUS,
+            ComboBoxDelegate([(label, status) for status, label in TodayTaskTableModel.STATUS_LABELS.items()], self.task_table)
+        )
+        self.task_table.setItemDelegateForColumn(TodayTaskTableModel.EFFORT, SpinBoxDelegate(0, 100, self.task_table))
+        self.detail_delegate = ButtonDelegate("Details", self.task_table)
+        self.detail_delegate.clicked.connect(self.show_task_detail_at)
+        self.task_table.setItemDelegateForColumn(TodayTaskTableModel.DETAILS, self.detail_delegate)
         self.task_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         tasks_layout.addWidget(self.task_table)
         
@@ -141,14 +233,14 @@ class MainView(QMainWindow):
         
         # Calculation button
         self.calculate_button = QPushButton("Calculate")
-        self.calculate_button.setFont(self.fonts["button"])
+        set_theme_font(self.calculate_button, self.fonts, "button")
         self.calculate_button.setEnabled(False)  # Disabled initially
         self.calculate_button.setToolTip("Calculate work time distribution (Ctrl+C)")
         footer_layout.addWidget(self.calculate_button)
         
         # Excel export button
         self.excel_export_button = QPushButton("EXCEL Export")
-        self.excel_export_button.setFont(self.fonts["button"])
+        set_theme_font(self.excel_export_button, self.fonts, "button")
         
         # Check for Excel dependencies
         try:
@@ -170,7 +262,7 @@ class MainView(QMainWindow):
         
         # Backup menu
         backup_button = QPushButton("Backup/Restore")
-        backup_button.setFont(self.fonts["button"])
+        set_theme_font(backup_button, self.fonts, "button")
         backup_menu = QMenu(self)
         
         create_backup_action = QAction("Create Backup", self)
@@ -187,75 +279,57 @@ class MainView(QMainWindow):
         footer_layout.addStretch()
         self.main_layout.addLayout(footer_layout)
     
+    def set_loading(self, loading):
+        """Show or clear the loading state, disabling the controls that need task data"""
+        self.loading_label.setText("Loading tasks...")
+        self.loading_label.setVisible(loading)
+        if loading:
+            widgets = [self.today_task_button, self.all_schedule_button,
+                       self.excel_export_button, self.search_box]
+            self._loading_disabled = [widget for widget in widgets if widget and widget.isEnabled()]
+            for widget in self._loading_disabled:
+                widget.setEnabled(False)
+            # Re-evaluated from the loaded tasks by update_calculate_button
+            self.calculate_button.setEnabled(False)
+        else:
+            for widget in self._loading_disabled:
+                widget.setEnabled(True)
+            self._loading_disabled = []
+    
+    def show_loading_progress(self, count):
+        """Show how many tasks have been loaded so far"""
+        self.loading_label.setText(f"Loading tasks... ({count} loaded)")
+    
     def update_today_tasks(self, tasks):
         """Update the today's tasks table"""
-        self.task_table.setRowCount(0)  # Clear existing rows
-        
-        for idx, task in enumerate(tasks):
-            self.task_table.insertRow(idx)
-            
-            # Task name (not editable)
-            name_item = QTableWidgetItem(task.name)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
-            
-            # Set background color based on priority - Fix color handling
-            try:
-                color_str = task.get_priority_color()
-                name_item.setBackground(QColor(color_str))
-            except Exception as e:
-                # Fallback to default color if there's an error
-                name_item.setBackground(QColor("#2196F3"))  # Default blue
-            
-            self.task_table.setItem(idx, 0, name_item)
-            
-            # Status (dropdown)
-            status_combo = QComboBox()
-            status_combo.addItems(["Working", "Planned", "Completed"])
-            # Map UI labels to internal values
-            status_map = {"Working": "working", "Planned": "planned", "Completed": "closed"}
-            reverse_map = {"working": "Working", "planned": "Planned", "closed": "Completed"}
-            
-            status_combo.setCurrentText(reverse_map.get(task.status, "Planned"))
-            status_combo.currentTextChanged.connect(
-                lambda text, t=task: self.update_task_attribute(t, "status", status_map.get(text, "planned"))
-            )
-            self.task_table.setCellWidget(idx, 1, status_combo)
-            
-            # Perceived effort (spinbox)
-            effort_spin = QSpinBox()
-            effort_spin.setRange(0, 100)
-            effort_spin.setValue(task.perceived_effort)
-            effort_spin.valueChanged.connect(lambda value, t=task: self.update_task_attribute(t, "perceived_effort", value))
-            self.task_table.setCellWidget(idx, 2, effort_spin)
-            
-            # Completed today (checkbox)
-            completed_check = QCheckBox()
-            completed_check.setChecked(task.completed_today)
-            completed_check.stateChanged.connect(lambda state, t=task: self.update_task_attribute(t, "completed_today", state == Qt.Checked))
-            check_widget = QWidget()
-            check_layout = QHBoxLayout(check_widget)
-            check_layout.addWidget(completed_check)
-            check_layout.setAlignment(Qt.AlignCenter)
-            check_layout.setContentsMargins(0, 0, 0, 0)
-            self.task_table.setCellWidget(idx, 3, check_widget)
-            
-            # Detail button
-            detail_button = QPushButton("Details")
-            self.task_table.setCellWidget(idx, 4, detail_button)
-            # Connect to show task detail view
-            detail_button.clicked.connect(lambda checked, t=task: self.show_task_detail(t))
+        # Only the model is reset; editors are created by the delegates on demand
+        self.task_model.set_tasks(tasks)
         
         # 計算ボタンの有効/無効を更新
         self.update_calculate_button(tasks)
     
+    def update_task_rows(self, tasks):
+        """Repaint the rows of the given tasks without rebuilding the table"""
+        self.task_model.refresh_tasks(tasks)
+    
+    def show_task_detail_at(self, index):
+        """Show the detail view for the task in the clicked row"""
+        task = self.task_model.task_at(index.row())
+        if task:
+            self.show_task_detail(task)
+    
     def update_task_attribute(self, task, attribute, value):
         """Update a task attribute and notify the model"""
         if hasattr(task, attribute):
-            setattr(task, attribute, value)
             if hasattr(self, 'task_detail_controller'):
-                self.task_detail_controller.model.notify()
-            # Update calculate button state after attribute change
-            self.update_calculate_button(self.task_detail_controller.get_filtered_tasks() if hasattr(self, 'task_detail_controller') else [])
+                # Go through the controller so the change is journaled
+                self.task_detail_controller.update_task(task, {attribute: value})
+            else:
+                setattr(task, attribute, value)
+                task.mark_modified((attribute,))
+            # Repaint only the edited row; the table already holds today's tasks for the button state
+            self.task_model.refresh_tasks([task])
+            self.update_calculate_button(self.task_model.tasks())
     
     def show_task_detail(self, task):
         """Show task detail in a new window"""
@@ -332,34 +406,18 @@ class MainView(QMainWindow):
     def toggle_theme(self):
         """Toggle between light and dark themes"""
         try:
-            # Determine current theme by examining stylesheet
-            current_stylesheet = self.styleSheet()
-            is_dark = "background-color: #282828" in current_stylesheet
-            
-            # Create new theme factory based on desired theme
-            if is_dark:
-                from views.builders.theme_factory import LightThemeFactory
-                new_factory = LightThemeFactory()
-            else:
-                from views.builders.theme_factory import DarkThemeFactory
-                new_factory = DarkThemeFactory()
-                
-            # Apply new theme
-            self.theme_factory = new_factory
-            self.colors = new_factory.create_color_scheme()
-            self.fonts = new_factory.create_font_scheme()
-            self.setStyleSheet(new_factory.create_style_sheet())
-            
-            # Emit signal to notify about theme change
-            if hasattr(self, 'task_detail_controller') and self.task_detail_controller:
-                # Notify the controller about the theme change
-                self.task_detail_controller.model.notify()
-                
-            logging.info(f"Theme changed to {'light' if is_dark else 'dark'}")
-            
+            # Applied application-wide, so every open window re-styles without a model refresh
+            ThemeService.instance().toggle()
         except Exception as e:
             ErrorHandler.handle_error(e, True, self, "Theme Toggle Error")
     
+    def apply_theme(self, theme):
+        """Use the compiled colours and fonts of a newly applied theme"""
+        self.theme_factory = theme.factory
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        apply_theme_fonts(self, self.fonts)
+    
     def export_to_excel(self):
         """Export tasks to Excel"""
         try:
@@ -435,6 +493,10 @@ class MainView(QMainWindow):
         try:
             from utils.backup_manager import BackupManager
             
+            # Background writes must reach the files before they are copied
+            if hasattr(self, 'task_detail_controller'):
+                self.task_detail_controller.flush_pending_writes()
+            
             backup_dir = BackupManager.create_backup()
             
             if backup_dir:
@@ -0,0 +1,240 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+
+class TaskTableModel(QAbstractTableModel):
+    """Base table model exposing a list of tasks, one task per row"""
+
+    COLUMNS = []
+
+    # Emitted with (task, attribute, value) when the user edits a cell
+    attribute_edited = pyqtSignal(object, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+        self._rows = {}  # Task id -> row
+
+    def set_tasks(self, tasks):
+        """Replace all rows with the given tasks"""
+        self.beginResetModel()
+        self._tasks = list(tasks)
+        self._rows = {task.id: row for row, task in enumerate(self._tasks)}
+        self.endResetModel()
+
+    def refresh_tasks(self, tasks):
+        """Repaint the rows of the given tasks"""
+        last_column = self.columnCount() - 1
+        for task in tasks:
+            row = self._rows.get(task.id)
+            if row is not None and row < self.rowCount():
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def task_at(self, row):
+        """Get the task shown in a row"""
+        if 0 <= row < len(self._tasks):
+            return self._tasks[row]
+        return None
+
+    def tasks(self):
+        """Get the tasks in row order"""
+        return list(self._tasks)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self.COLUMNS):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+class TodayTaskTableModel(TaskTableModel):
+    """Table model for today's tasks in the main window"""
+
+    COLUMNS = ["Task Name", "Status", "Effort", "Completed", "Details"]
+    NAME, STATUS, EFFORT, COMPLETED, DETAILS = range(5)
+
+    # Map internal status values to UI labels
+    STATUS_LABELS = {"working": "Working", "planned": "Planned", "closed": "Completed"}
+
+    _priority_colors = {}  # Color string -> shared QColor
+
+    def data(self, index, role=Qt.DisplayRole):
+        task = self.task_at(index.row()) if index.isValid() else None
+        if task is None:
+            return None
+        column = index.column()
+
+        if column == self.NAME:
+            if role == Qt.DisplayRole:
+                return task.name
+            if role == Qt.BackgroundRole:
+                return self._priority_color(task)
+        elif column == self.STATUS:
+            if role == Qt.DisplayRole:
+                return self.STATUS_LABELS.get(task.status, "Planned")
+            if role == Qt.EditRole:
+                return task.status
+        elif column == self.EFFORT:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return task.perceived_effort
+        elif column == self.COMPLETED:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if task.completed_today else Qt.Unchecked
+        elif column == self.DETAILS:
+            if role == Qt.DisplayRole:
+                return "Details"
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        column = index.column()
+        if column in (self.STATUS, self.EFFORT):
+            flags |= Qt.ItemIsEditable
+        elif column == self.COMPLETED:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        task = self.task_at(index.row()) if index.isValid() else None
+        if task is None:
+            return False
+        column = index.column()
+
+        # The owner applies the edit through its controller; the model event repaints the row
+        if column == self.STATUS and role == Qt.EditRole:
+            self.attribute_edited.emit(task, "status", value)
+        elif column == self.EFFORT and role == Qt.EditRole:
+            self.attribute_edited.emit(task, "perceived_effort", int(value))
+        elif column == self.COMPLETED and role == Qt.CheckStateRole:
+            self.attribute_edited.emit(task, "completed_today", value == Qt.Checked)
+        else:
+            return False
+        return True
+
+    @classmethod
+    def _priority_color(cls, task):
+        color_str = task.get_priority_color()
+        color = cls._priority_colors.get(color_str)
+        if color is None:
+            color = cls._priority_colors[color_str] = QColor(color_str)
+        return color
+
+class AllScheduleTableModel(TaskTableModel):
+    """Table model for every scheduled task, populated incrementally as the view scrolls"""
+
+    COLUMNS = ["Task Name", "Status", "Days", "Tags", "Edit", "Delete"]
+    NAME, STATUS, DAYS, TAGS, EDIT, DELETE = range(6)
+    TEXT_COLUMNS = (NAME, STATUS, DAYS, TAGS)
+    FETCH_BATCH_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._schedule_order = []
+        self._loaded = 0
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def set_tasks(self, tasks):
+        """Replace all rows, keeping the current sort, and show the first batch"""
+        self.beginResetModel()
+        self._schedule_order = list(tasks)
+        self._apply_sort()
+        self._loaded = min(len(self._tasks), self.FETCH_BATCH_SIZE)
+        self.endResetModel()
+
+    def column_text(self, task, column):
+        """Get the text shown for a task in a column"""
+        if column == self.NAME:
+            return task.name
+        if column == self.STATUS:
+            return task.status
+        if column == self.DAYS:
+            return ", ".join(task.days)
+        if column == self.TAGS:
+            return ", ".join(task.tags)
+        return ""
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._tasks)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH_SIZE, len(self._tasks) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """Make every task available as a row"""
+        if self._loaded < len(self._tasks):
+            self.beginInsertRows(QModelIndex(), self._loaded, len(self._tasks) - 1)
+            self._loaded = len(self._tasks)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        task = self.task_at(index.row()) if index.isValid() else None
+        if task is None or role != Qt.DisplayRole:
+            return None
+        return self.column_text(task, index.column())
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort all tasks, including rows not fetched yet; column -1 restores schedule order"""
+        self.beginResetModel()
+        self._sort_column = column if column in self.TEXT_COLUMNS else -1
+        self._sort_order = order
+        self._apply_sort()
+        self.endResetModel()
+
+    def _apply_sort(self):
+        tasks = self._schedule_order
+        if self._sort_column != -1:
+            column = self._sort_column
+            tasks = sorted(tasks, key=lambda task: self.column_text(task, column).lower(),
+                           reverse=self._sort_order == Qt.DescendingOrder)
+        self._tasks = list(tasks)
+        self._rows = {task.id: row for row, task in enumerate(self._tasks)}
+
+class TaskFilterProxyModel(QSortFilterProxyModel):
+    """Proxy that shows only matching task ids and sorts through the source model"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matching_ids = None  # None shows every task
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self._fetch_for_filter)
+
+    def set_matching_ids(self, task_ids):
+        """Show only the given task ids, or every task when None"""
+        self._matching_ids = set(task_ids) if task_ids is not None else None
+        self._fetch_for_filter()
+        self.invalidateFilter()
+
+    def _fetch_for_filter(self):
+        # Matches may be in rows the view has not fetched yet
+        if self._matching_ids is not None:
+            self.sourceModel().fetch_all()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._matching_ids is None:
+            return True
+        task = self.sourceModel().task_at(source_row)
+        return task is not None and task.id in self._matching_ids
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # The source sorts every task; sorting here would only cover the fetched rows
+        self.sourceModel().sort(column, order)
+
+    def task_at(self, index):
+        """Get the task for a proxy index"""
+        return self.sourceModel().task_at(self.mapToSource(index).row())
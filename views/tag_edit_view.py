@@ -1,5 +1,7 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                           QListWidget, QLineEdit, QLabel, QMessageBox)
+                           QListWidget, QLineEdit, QLabel, QMessageBox,
+                           QInputDialog)
+from views.builders.theme_service import ThemeService
 
 class TagEditDialog(QDialog):
     """Dialog for editing tags"""
@@ -7,12 +9,13 @@ class TagEditDialog(QDialog):
     def __init__(self, theme_factory, tags, controller):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
         
         self.tags = tags.copy()
         self.controller = controller
+        self.operations = []  # Pending tag operations, applied in order on OK
         
         self.setWindowTitle("Edit Tags")
         self.setMinimumSize(350, 400)
@@ -44,10 +47,18 @@ class TagEditDialog(QDialog):
         
         layout.addLayout(input_layout)
         
-        # Delete selected tag
+        # Rename or delete selected tag
+        edit_layout = QHBoxLayout()
+        
+        rename_button = QPushButton("Rename")
+        rename_button.clicked.connect(self.rename_tag)
+        edit_layout.addWidget(rename_button)
+        
         delete_button = QPushButton("Delete")
         delete_button.clicked.connect(self.delete_tag)
-        layout.addWidget(delete_button)
+        edit_layout.addWidget(delete_button)
+        
+        layout.addLayout(edit_layout)
         
         # Ok/Cancel buttons
         button_layout = QHBoxLayout()
@@ -74,10 +85,40 @@ class TagEditDialog(QDialog):
             return
             
         self.tags.append(new_tag)
-        self.tag_list.clear()
-        self.tag_list.addItems(self.tags)
+        self.operations.append(("add", new_tag))
+        self.refresh_tag_list()
         self.tag_input.clear()
     
+    def rename_tag(self):
+        """Rename the selected tag, merging it if the new name already exists"""
+        selected_items = self.tag_list.selectedItems()
+        
+        if not selected_items:
+            QMessageBox.information(self, "Information", "Please select a tag to rename.")
+            return
+        
+        tag = selected_items[0].text()
+        new_tag, ok = QInputDialog.getText(self, "Rename Tag", f"New name for '{tag}':", text=tag)
+        new_tag = new_tag.strip()
+        
+        if not ok or not new_tag or new_tag == tag:
+            return
+        
+        if new_tag in self.tags:
+            confirm = QMessageBox.question(
+                self, "Confirm", f"Tag '{new_tag}' already exists. Merge '{tag}' into it?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if confirm != QMessageBox.Yes:
+                return
+            self.tags.remove(tag)
+            self.operations.append(("merge", tag, new_tag))
+        else:
+            self.tags[self.tags.index(tag)] = new_tag
+            self.operations.append(("rename", tag, new_tag))
+        
+        self.refresh_tag_list()
+    
     def delete_tag(self):
         """Delete the selected tag"""
         selected_items = self.tag_list.selectedItems()
@@ -88,29 +129,29 @@ class TagEditDialog(QDialog):
             
         tag = selected_items[0].text()
         
+        message = f"Delete tag '{tag}'?"
+        task_count = self.controller.count_tasks_with_tag(tag)
+        if task_count:
+            message += f"\nIt will also be removed from {task_count} task(s)."
+        
         confirm = QMessageBox.question(
-            self, "Confirm", f"Delete tag '{tag}'?",
+            self, "Confirm", message,
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         
         if confirm == QMessageBox.Yes:
             self.tags.remove(tag)
-            self.tag_list.clear()
-            self.tag_list.addItems(self.tags)
+            self.operations.append(("delete", tag))
+            self.refresh_tag_list()
     
-    def save_tags(self):
-        """Save the tags and close the dialog"""
-        # Instead of directly accessing model.tags, use the controller methods
-        current_tags = self.controller.get_all_tags()
-        
-        # Add new tags
-        for tag in self.tags:
-            if tag not in current_tags:
-                self.controller.add_tag(tag)
-                
-        # Remove deleted tags
-        for tag in current_tags:
-            if tag not in self.tags:
-                self.controller.delete_tag(tag)
+    def refresh_tag_list(self):
+        """Show the current tag list"""
+        self.tag_list.clear()
+        self.tag_list.addItems(self.tags)
     
+    def save_tags(self):
+        """Apply the pending tag operations and close the dialog"""
+        # Each operation only touches the tasks carrying the tag
+        self.controller.apply_tag_operations(self.operations)
+        self.operations = []
         self.accept()
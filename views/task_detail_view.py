@@ -2,24 +2,50 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                             QLineEdit, QTextEdit, QPushButton, QComboBox,
                             QCheckBox, QGridLayout, QGroupBox)
 from PyQt5.QtCore import Qt
+from views.builders.theme_service import ThemeService, apply_theme_fonts
 
 class TaskDetailView(QDialog):
     """Dialog for displaying and editing task details"""
     
-    def __init__(self, theme_factory, task, controller=None):
+    # Internal status values and their labels in the status combo box
+    STATUS_LABELS = {"working": "Working", "planned": "Planned", "closed": "Completed"}
+    
+    def __init__(self, theme_factory, task=None, controller=None):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        ThemeService.instance().theme_changed.connect(self.apply_theme)
         
-        self.task = task
+        self.task = None
         self.controller = controller
         
-        self.setWindowTitle(f"Task Details: {task.name}")
+        self.setWindowTitle("Task Details")
         self.setMinimumSize(500, 400)
         
         self.setup_ui()
+        if task is not None:
+            self.bind_task(task)
+    
+    def apply_theme(self, theme):
+        """Use the compiled colours and fonts of a newly applied theme"""
+        self.theme_factory = theme.factory
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        apply_theme_fonts(self, self.fonts)
+    
+    def bind_task(self, task):
+        """Show a task in the dialog's fields, so the dialog can be reused for another task"""
+        self.task = task
+        self.setWindowTitle(f"Task Details: {task.name}")
+        self.name_edit.setText(task.name)
+        self.status_combo.setCurrentText(self.STATUS_LABELS.get(task.status, "Planned"))
+        for day, checkbox in self.day_checkboxes.items():
+            checkbox.setChecked(day in task.days)
+        self.completed_check.setChecked(task.completed_today)
+        self.effort_edit.setText(str(task.perceived_effort))
+        self.details_edit.setPlainText(task.details)
 
     def setup_ui(self):
         """Set up the UI components"""
@@ -30,17 +56,13 @@ class TaskDetailView(QDialog):
         
         # Task name
         form_layout.addWidget(QLabel("Task Name:"), 0, 0)
-        self.name_edit = QLineEdit(self.task.name)
+        self.name_edit = QLineEdit()
         form_layout.addWidget(self.name_edit, 0, 1)
         
         # Task status
         form_layout.addWidget(QLabel("Status:"), 1, 0)
         self.status_combo = QComboBox()
         self.status_combo.addItems(["Working", "Planned", "Completed"])
-        
-        # Map for internal values to UI
-        status_map = {"working": "Working", "planned": "Planned", "closed": "Completed"}
-        self.status_combo.setCurrentText(status_map.get(self.task.status, "Planned"))
         form_layout.addWidget(self.status_combo, 1, 1)
         
         # Days
@@ -60,7 +82,6 @@ class TaskDetailView(QDialog):
         
         for day_en, day_ui in day_names.items():
             checkbox = QCheckBox(day_ui)
-            checkbox.setChecked(day_en in self.task.days)
             days_layout.addWidget(checkbox)
             self.day_checkboxes[day_en] = checkbox
         
@@ -69,17 +90,16 @@ class TaskDetailView(QDialog):
         # Completion checkbox
         form_layout.addWidget(QLabel("Completed Today:"), 3, 0)
         self.completed_check = QCheckBox()
-        self.completed_check.setChecked(self.task.completed_today)
         form_layout.addWidget(self.completed_check, 3, 1)
         
         # Perceived effort
         form_layout.addWidget(QLabel("Perceived Effort:"), 4, 0)
-        self.effort_edit = QLineEdit(str(self.task.perceived_effort))
+        self.effort_edit = QLineEdit()
         form_layout.addWidget(self.effort_edit, 4, 1)
         
         # Task details
         form_layout.addWidget(QLabel("Details:"), 5, 0, Qt.AlignTop)
-        self.details_edit = QTextEdit(self.task.details)
+        self.details_edit = QTextEdit()
         form_layout.addWidget(self.details_edit, 5, 1)
         
         layout.addLayout(form_layout)
@@ -104,7 +124,7 @@ class TaskDetailView(QDialog):
             return
         
         # Convert status from UI to internal value
-        status_map = {"Working": "working", "Planned": "planned", "Completed": "closed"}
+        status_map = {label: status for status, label in self.STATUS_LABELS.items()}
         
         selected_days = []
         for day_en, checkbox in self.day_checkboxes.items():
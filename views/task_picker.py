@@ -0,0 +1,127 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListView, QApplication
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, QEvent, pyqtSignal
+
+class TaskPickerListModel(QAbstractListModel):
+    """List model holding the best matches of a task search, one page at a time"""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._find = None  # Callable (query, limit) -> tasks, best matches first
+        self._query = ""
+        self._tasks = []
+        self._exhausted = True
+
+    def set_finder(self, find):
+        """Set the function that ranks tasks for a query"""
+        self._find = find
+
+    def set_query(self, query):
+        """Show the first page of matches for a query"""
+        self.beginResetModel()
+        self._query = query
+        self._tasks = list(self._find(query, self.PAGE_SIZE)) if self._find else []
+        self._exhausted = len(self._tasks) < self.PAGE_SIZE
+        self.endResetModel()
+
+    def task_at(self, row):
+        """Get the task shown in a row"""
+        if 0 <= row < len(self._tasks):
+            return self._tasks[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._find:
+            return
+        # Ranking is deterministic, so a larger page starts with the rows already shown
+        limit = len(self._tasks) + self.PAGE_SIZE
+        tasks = self._find(self._query, limit)
+        self._exhausted = len(tasks) < limit
+        extra = tasks[len(self._tasks):]
+        if extra:
+            self.beginInsertRows(QModelIndex(), len(self._tasks), len(self._tasks) + len(extra) - 1)
+            self._tasks.extend(extra)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        task = self.task_at(index.row()) if index.isValid() else None
+        if task is None:
+            return None
+        if role == Qt.DisplayRole:
+            # Formatted only for the rows the view actually paints
+            return f"{task.name} ({', '.join(task.days)})"
+        if role == Qt.UserRole:
+            return task
+        return None
+
+class TaskPicker(QWidget):
+    """Type-ahead task picker: a search field over a lazily filled list of matches"""
+
+    SEARCH_DELAY_MS = 100
+
+    task_chosen = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Type to search tasks...")
+        self.search_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.search_edit)
+
+        self.model = TaskPickerListModel(self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        layout.addWidget(self.list_view)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.refresh)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_edit.returnPressed.connect(self.choose_current)
+        self.list_view.activated.connect(lambda index: self.task_chosen.emit(self.model.task_at(index.row())))
+
+        # Up/Down in the search field move through the matches
+        self.search_edit.installEventFilter(self)
+
+    def set_finder(self, find):
+        """Set the function that ranks tasks: find(query, limit) -> tasks"""
+        self.model.set_finder(find)
+
+    def refresh(self):
+        """Re-run the search for the current text and select the best match"""
+        self.search_timer.stop()
+        self.model.set_query(self.search_edit.text())
+        if self.model.rowCount():
+            self.list_view.setCurrentIndex(self.model.index(0, 0))
+
+    def current_task(self):
+        """Get the selected match, or the best one when nothing is selected"""
+        index = self.list_view.currentIndex()
+        return self.model.task_at(index.row() if index.isValid() else 0)
+
+    def choose_current(self):
+        """Emit task_chosen for the selected match"""
+        if self.search_timer.isActive():
+            self.refresh()
+        task = self.current_task()
+        if task:
+            self.task_chosen.emit(task)
+
+    def eventFilter(self, obj, event):
+        if obj is self.search_edit and event.type() == QEvent.KeyPress and \
+                event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            QApplication.sendEvent(self.list_view, event)
+            return True
+        return super().eventFilter(obj, event)
@@ -1,10 +1,10 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QTableWidget, QTableWidgetItem, QHeaderView,
-                            QCheckBox, QMessageBox, QGroupBox, QLineEdit,
-                            QComboBox, QTextEdit)
+                            QCheckBox, QMessageBox, QGroupBox)
 from PyQt5.QtCore import Qt
-from datetime import datetime
-from models.task_model import Task
+from models.task_model import current_day_name
+from views.task_picker import TaskPicker
+from views.builders.theme_service import ThemeService, set_theme_font, apply_theme_fonts
 
 class TodayTaskView(QDialog):
     """View for editing today's tasks"""
@@ -12,14 +12,16 @@ class TodayTaskView(QDialog):
     def __init__(self, theme_factory):
         super().__init__()
         self.theme_factory = theme_factory
-        self.colors = theme_factory.create_color_scheme()
-        self.fonts = theme_factory.create_font_scheme()
-        self.setStyleSheet(theme_factory.create_style_sheet())
+        theme = ThemeService.instance().theme(theme_factory.name)
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        ThemeService.instance().theme_changed.connect(self.apply_theme)
         
         self.controller = None
         self.tasks = []
         self.all_tasks = []  # 全タスクを保持する変数を追加
         self.all_tags = []
+        self.task_rows = {}  # Task id -> table row, for row-level updates
         self.show_exceptions = False
         self.add_form_visible = False
         
@@ -49,6 +51,25 @@ class TodayTaskView(QDialog):
         self.tasks = tasks
         self.update_task_table()
     
+    def apply_theme(self, theme):
+        """Use the compiled colours and fonts of a newly applied theme"""
+        self.theme_factory = theme.factory
+        self.colors = theme.colors
+        self.fonts = theme.fonts
+        apply_theme_fonts(self, self.fonts)
+    
+    def reset_state(self):
+        """Clear the tasks and form state, as in a newly built view, before the view is reused"""
+        self.tasks = []
+        self.show_exceptions = False
+        self.exception_checkbox.blockSignals(True)
+        self.exception_checkbox.setChecked(False)
+        self.exception_checkbox.blockSignals(False)
+        if self.add_form_visible:
+            self.toggle_add_form()
+        self.task_picker.search_edit.clear()
+        self.update_task_table()
+    
     def set_tags(self, tags):
         """Set available tags"""
         self.all_tags = tags
@@ -59,7 +80,7 @@ class TodayTaskView(QDialog):
         
         # Title
         title_label = QLabel("Edit Today's Tasks")
-        title_label.setFont(self.fonts["header"])
+        set_theme_font(title_label, self.fonts, "header")
         header_layout.addWidget(title_label)
         
         # Exception checkbox
@@ -86,18 +107,20 @@ class TodayTaskView(QDialog):
         self.add_form_group = QGroupBox("Add Task")
         self.add_form_layout = QVBoxLayout(self.add_form_group)
         
-        # Task selection dropdown
+        # Type-ahead task picker
         task_selection_layout = QHBoxLayout()
         task_selection_layout.addWidget(QLabel("Select Task:"))
-        self.task_selection_combo = QComboBox()
-        self.task_selection_combo.setMinimumWidth(300)
-        task_selection_layout.addWidget(self.task_selection_combo)
+        self.task_picker = TaskPicker()
+        self.task_picker.setMinimumWidth(300)
+        self.task_picker.set_finder(self.find_pickable_tasks)
+        self.task_picker.task_chosen.connect(self.add_existing_task)
+        task_selection_layout.addWidget(self.task_picker)
         self.add_form_layout.addLayout(task_selection_layout)
         
         # Buttons
         add_button_layout = QHBoxLayout()
         add_task_button = QPushButton("Add")
-        add_task_button.clicked.connect(self.add_existing_task)
+        add_task_button.clicked.connect(lambda: self.add_existing_task())
         add_button_layout.addWidget(add_task_button)
         
         cancel_add_button = QPushButton("Cancel")
@@ -140,6 +163,7 @@ class TodayTaskView(QDialog):
     def update_task_table(self):
         """Update the task table with current tasks"""
         self.task_table.setRowCount(0)  # Clear existing rows
+        self.task_rows = {}
         
         # Filter tasks based on today's day or exceptions
         filtered_tasks = self.filter_today_tasks()
@@ -149,6 +173,7 @@ class TodayTaskView(QDialog):
         
         for idx, task in enumerate(filtered_tasks):
             self.task_table.insertRow(idx)
+            self.task_rows[task.id] = idx
             
             # Task name
             name_item = QTableWidgetItem(task.name)
@@ -170,12 +195,24 @@ class TodayTaskView(QDialog):
             details_item = QTableWidgetItem(task.details)
             self.task_table.setItem(idx, 4, details_item)
     
+    def update_task_rows(self, tasks):
+        """Update the text of the given tasks' rows in place"""
+        for task in tasks:
+            row = self.task_rows.get(task.id)
+            if row is None:
+                continue
+            values = (task.name, task.status, ", ".join(task.days), ", ".join(task.tags), task.details)
+            for column, value in enumerate(values):
+                item = self.task_table.item(row, column)
+                if item:
+                    item.setText(value)
+    
     def filter_today_tasks(self):
         """Filter tasks based on whether they're for today or exceptions are allowed"""
         if self.show_exceptions:
             return self.tasks
         else:
-            today = datetime.now().strftime("%A")
+            today = current_day_name()
             return [task for task in self.tasks if today in task.days or "Free" in task.days]
 
     def update_tags_combo(self):
@@ -197,7 +234,7 @@ class TodayTaskView(QDialog):
         self.update_task_table()
         
         # タスク選択ドロップダウンも更新
-        if hasattr(self, 'task_selection_combo'):
+        if hasattr(self, 'task_picker'):
             self.update_task_selection_dropdown()
     
     def toggle_add_form(self):
@@ -208,93 +245,44 @@ class TodayTaskView(QDialog):
         if self.add_form_visible:
             # 追加可能なタスクをドロップダウンに表示
             self.update_task_selection_dropdown()
+            self.task_picker.search_edit.setFocus()
     
     def update_task_selection_dropdown(self):
-        """Update the task selection dropdown"""
-        self.task_selection_combo.clear()
-        
+        """Update the task picker's matches"""
+        # Only the visible picker is refreshed, and it only ranks one page of matches
+        if self.add_form_visible:
+            self.task_picker.refresh()
+    
+    def find_pickable_tasks(self, query, limit):
+        """Rank tasks that can be added: Free and today's tasks, other days' only with exceptions"""
         if not self.controller:
-            return
-        
-        # Get all tasks from controller
-        all_tasks = self.controller.get_all_tasks()
-        if not all_tasks:
-            self.task_selection_combo.addItem("No tasks available", None)
-            return
-            
-        # Get names of tasks already in today's list to avoid duplicates
-        # Use names instead of IDs as a more reliable way to check for duplicates
-        current_task_names = {task.name for task in self.tasks}
-        
-        # Filter available tasks
-        today = datetime.now().strftime("%A")
-        available_tasks = []
-        
-        for task in all_tasks:
-            # Skip if task is already in today's list
-            if task.name in current_task_names:
-                continue
-            
-            # Add according to our rules
-            if "Free" in task.days:
-                # Rule 1: Free tasks are always available
-                available_tasks.append(task)
-            elif today in task.days:
-                # Rule 2: Today's tasks are always available
-                available_tasks.append(task)
-            elif self.show_exceptions:
-                # Rule 3: Other days' tasks only when exceptions are checked
-                available_tasks.append(task)
-        
-        # Add tasks to dropdown
-        if available_tasks:
-            for task in available_tasks:
-                days_str = ", ".join(task.days)
-                display_text = f"{task.name} ({days_str})"
-                self.task_selection_combo.addItem(display_text, task)
-        else:
-            # Show message if no tasks are available
-            self.task_selection_combo.addItem("No tasks available to add", None)
+            return []
+        current_task_ids = [task.id for task in self.tasks]
+        return self.controller.find_pickable_tasks(query, self.show_exceptions, current_task_ids, limit)
     
-    def add_existing_task(self):
+    def add_existing_task(self, selected_task=None):
         """Add an existing task to today's tasks"""
-        if self.task_selection_combo.count() == 0:
-            QMessageBox.information(self, "Information", "No tasks available to add.")
-            return
-        
-        # Get the selected task
-        selected_index = self.task_selection_combo.currentIndex()
-        if selected_index < 0:
-            return
-        
-        selected_task = self.task_selection_combo.itemData(selected_index)
+        if selected_task is None:
+            selected_task = self.task_picker.current_task()
         
         if not selected_task:
-            QMessageBox.warning(self, "Warning", "Task not found.")
+            QMessageBox.information(self, "Information", "No tasks available to add.")
             return
         
         # Add to today's tasks list
-        if selected_task not in self.tasks:
+        if selected_task.id not in {task.id for task in self.tasks}:
             # Add to the view's task list
             self.tasks.append(selected_task)
             
             # Save the changes immediately
             if self.controller:
                 # Save to today's tasks configuration
+                # The controller notifies the model once, which refreshes the table
                 save_result = self.controller.save_today_tasks(self.tasks)
                 if save_result:
-                    # Notify model about the change
-                    self.controller.model.notify()
-                    
-                    # Update task table
-                    self.update_task_table()
-                    
                     # Close the form
                     self.toggle_add_form()
                     
-                    # Update dropdown to reflect the changes
-                    self.update_task_selection_dropdown()
-                    
                     # Show success message
                     QMessageBox.information(self, "Success", f"Task '{selected_task.name}' added to today's tasks.")
                 else:
@@ -303,7 +291,6 @@ class TodayTaskView(QDialog):
                 # If no controller, just update the UI
                 self.update_task_table()
                 self.toggle_add_form()
-                self.update_task_selection_dropdown()
             
     def delete_selected_task(self):
         """Delete the selected task"""
@@ -329,16 +316,15 @@ class TodayTaskView(QDialog):
         
         if confirm == QMessageBox.Yes:
             self.tasks.remove(task)
-            self.update_task_table()
             
-            # Notify the controller if available
+            # Notify the controller if available; the refresh redraws the table and dropdown
             if self.controller:
                 self.controller.model.notify()
+            else:
+                self.update_task_table()
+                self.update_task_selection_dropdown()
             
             QMessageBox.information(self, "Success", "Task removed.")
-            
-            # Update dropdown with available tasks
-            self.update_task_selection_dropdown()
     
     def save_tasks(self):
         """Save all tasks"""
@@ -350,12 +336,7 @@ class TodayTaskView(QDialog):
             save_result = self.controller.save_today_tasks(tasks_to_save)
             
             if save_result:
-                # Explicitly notify the model to ensure all views are updated
-                self.controller.model.notify()
-                
-                # Update task table to reflect changes
-                self.update_task_table()
-                
+                # The controller has already notified the model, which refreshes this view
                 # Show success message
                 QMessageBox.information(self, "Success", "Tasks saved successfully.")
             else: